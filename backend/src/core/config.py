@@ -1,4 +1,6 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -11,17 +13,26 @@ class Settings(BaseSettings):
     ollama_embed_timeout_seconds: int = 300
     ollama_health_timeout_seconds: int = 5
     ollama_keep_alive: str = "-1"
+    ollama_warmup: bool = True
     lightrag_llm_timeout_seconds: int = 900
     lightrag_embedding_timeout_seconds: int = 300
 
     lightrag_context_window: int = 32768
     lightrag_embedding_dim: int = 1024
     lightrag_embedding_max_tokens: int = 8192
+    max_cached_rag_instances: int = 32
 
     data_dir: str = "/app/data"
     db_path: str = "/app/data/metadata.db"
+    db_reader_pool_size: int = 8
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
 
-    model_config = {"env_file": ".env", "extra": "ignore"}
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing the environment and `.env` once."""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
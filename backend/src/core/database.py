@@ -1,6 +1,10 @@
-import aiosqlite
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+import aiosqlite
+
 from src.core.config import settings
 
 SCHEMA = """
@@ -31,7 +35,7 @@ CREATE TABLE IF NOT EXISTS conversations (
 );
 
 CREATE TABLE IF NOT EXISTS messages (
-    id TEXT PRIMARY KEY,
+    id INTEGER PRIMARY KEY,
     conversation_id TEXT NOT NULL,
     role TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
     content TEXT NOT NULL,
@@ -39,24 +43,179 @@ CREATE TABLE IF NOT EXISTS messages (
     created_at TEXT NOT NULL DEFAULT (datetime('now')),
     FOREIGN KEY (conversation_id) REFERENCES conversations(id) ON DELETE CASCADE
 );
+
+CREATE INDEX IF NOT EXISTS idx_groups_created ON groups(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_documents_group ON documents(group_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_conversations_group ON conversations(group_id, updated_at DESC);
+-- Message ids increase with insertion, so history is ordered by id and an
+-- index on conversation_id alone (entries sorted by rowid) serves both the
+-- full listing and bounded "before id" page scans.
+DROP INDEX IF EXISTS idx_messages_conv;
+CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages(conversation_id);
+"""
+
+# Created after any table rebuild below, so re-inserting migrated messages
+# does not bump every conversation's updated_at.
+TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS trg_messages_touch_conversation
+AFTER INSERT ON messages
+BEGIN
+    UPDATE conversations SET updated_at = datetime('now') WHERE id = NEW.conversation_id;
+END;
+"""
+
+# Databases created before messages were keyed by rowid still have a TEXT
+# id (and a separate unique index for it). Rebuild the table in place,
+# keeping message order; message ids are not referenced anywhere else.
+MESSAGES_ROWID_MIGRATION = f"""
+BEGIN;
+DROP TRIGGER IF EXISTS trg_messages_touch_conversation;
+DROP INDEX IF EXISTS idx_messages_conv;
+DROP INDEX IF EXISTS idx_messages_conversation;
+ALTER TABLE messages RENAME TO messages_legacy;
+{SCHEMA}
+INSERT INTO messages (conversation_id, role, content, query_mode, created_at)
+SELECT conversation_id, role, content, query_mode, created_at
+FROM messages_legacy
+ORDER BY created_at, rowid;
+DROP TABLE messages_legacy;
+COMMIT;
 """
 
+# ── Connection Pool ───────────────────────────────────────────────────
+# WAL allows many concurrent readers alongside a single writer, so the
+# pool keeps one long-lived writer connection (serialized by a lock) and
+# a bounded set of reader connections handed out through a queue.
+
+# Fixed rather than derived from os.cpu_count(), which reports the host's
+# cores inside a container; each reader holds its own page cache.
+READER_POOL_SIZE = settings.db_reader_pool_size
+
+# sqlite3 keeps prepared statements in a per-connection LRU keyed by SQL
+# text, and pooled connections live for the whole process. Sized well
+# above the number of distinct statements the services issue, so none is
+# ever evicted and re-prepared.
+STATEMENT_CACHE_SIZE = 256
+
+_writer_lock = asyncio.Lock()
+_writer: aiosqlite.Connection | None = None
+_reader_pool: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue(maxsize=READER_POOL_SIZE)
+_reader_count = 0
+
+
+# Applied to every new connection. journal_mode is persistent in the
+# database file, so WAL is set once in init_database() instead.
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    # Truncate the WAL back to 64 MB after checkpoints instead of letting it
+    # keep the size of its largest burst.
+    "PRAGMA journal_size_limit=67108864",
+)
+
 
 async def get_connection() -> aiosqlite.Connection:
-    """Get a database connection with WAL mode and foreign keys enabled."""
-    db = await aiosqlite.connect(settings.db_path)
+    """Open a new database connection with foreign keys and server-grade PRAGMAs applied."""
+    db = await aiosqlite.connect(settings.db_path, cached_statements=STATEMENT_CACHE_SIZE)
     db.row_factory = aiosqlite.Row
-    await db.execute("PRAGMA journal_mode=WAL")
-    await db.execute("PRAGMA foreign_keys=ON")
+    for pragma in CONNECTION_PRAGMAS:
+        await db.execute(pragma)
     return db
 
 
+async def _get_writer() -> aiosqlite.Connection:
+    global _writer
+    if _writer is None:
+        _writer = await get_connection()
+    return _writer
+
+
+@asynccontextmanager
+async def acquire_writer() -> AsyncIterator[aiosqlite.Connection]:
+    """Acquire the shared writer connection inside a `BEGIN IMMEDIATE` transaction.
+
+    The transaction is committed when the block exits normally and rolled
+    back if it raises, so callers never commit explicitly.
+    """
+    async with _writer_lock:
+        db = await _get_writer()
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            await db.rollback()
+            raise
+        await db.commit()
+
+
+@asynccontextmanager
+async def acquire_reader() -> AsyncIterator[aiosqlite.Connection]:
+    """Acquire a reader connection from the pool, opening one lazily if below capacity."""
+    global _reader_count
+    if _reader_pool.empty() and _reader_count < READER_POOL_SIZE:
+        _reader_count += 1
+        try:
+            db = await get_connection()
+        except BaseException:
+            _reader_count -= 1
+            raise
+    else:
+        db = await _reader_pool.get()
+    try:
+        yield db
+    finally:
+        _reader_pool.put_nowait(db)
+
+
 async def init_database() -> None:
-    """Initialize the database schema and ensure data directories exist."""
+    """Initialize the database schema, ensure data directories exist, and prime the pool."""
+    global _reader_count
     Path(settings.data_dir).mkdir(parents=True, exist_ok=True)
-    db = await get_connection()
-    try:
+    async with _writer_lock:
+        db = await _get_writer()
+        # Cursors are closed before any DDL runs: SQLite refuses to drop a
+        # schema object while a statement on the connection is still active.
+        async with db.execute("SELECT journal_mode FROM pragma_journal_mode") as cursor:
+            row = await cursor.fetchone()
+        if row[0].lower() != "wal":
+            await db.execute("PRAGMA journal_mode=WAL")
         await db.executescript(SCHEMA)
         await db.commit()
-    finally:
+
+        async with db.execute("SELECT type FROM pragma_table_info('messages') WHERE name = 'id'") as cursor:
+            row = await cursor.fetchone()
+        if row[0].upper() != "INTEGER":
+            await db.executescript(MESSAGES_ROWID_MIGRATION)
+        await db.executescript(TRIGGERS)
+
+    while _reader_count < READER_POOL_SIZE:
+        _reader_count += 1
+        _reader_pool.put_nowait(await get_connection())
+
+
+async def close_database() -> None:
+    """Close the writer and every pooled reader connection. Called on app shutdown."""
+    global _writer, _reader_count
+    async with _writer_lock:
+        if _writer is not None:
+            await _writer.close()
+            _writer = None
+
+    while not _reader_pool.empty():
+        db = _reader_pool.get_nowait()
         await db.close()
+        _reader_count -= 1
+
+
+@asynccontextmanager
+async def database_lifespan() -> AsyncIterator[None]:
+    """Open and prime the connection pool for the duration of the block, then close it."""
+    await init_database()
+    try:
+        yield
+    finally:
+        await close_database()
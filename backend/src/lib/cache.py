@@ -0,0 +1,73 @@
+"""In-process TTL cache for read-only service calls.
+
+Entries are grouped by namespace so a mutation can drop every cached read
+it may affect. TTLs are short, so a missed invalidation is bounded and the
+cache never grows past `MAX_ENTRIES`.
+"""
+
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from functools import wraps
+
+DEFAULT_TTL_SECONDS = 5.0
+MAX_ENTRIES = 1024
+
+GROUPS_NAMESPACE = "groups"
+
+_entries: dict[Hashable, tuple[float, int, object]] = {}
+_generations: dict[str, int] = {}
+
+
+def group_namespace(group_id: str) -> str:
+    """Namespace for reads scoped to a single group (documents, conversations)."""
+    return f"group:{group_id}"
+
+
+def cached[**P, R](
+    namespace: str | Callable[[str], str],
+    ttl_seconds: float = DEFAULT_TTL_SECONDS,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Cache an async function's result per namespace and call arguments.
+
+    Args:
+        namespace: Fixed namespace, or a callable deriving it from the first
+            positional argument (e.g. `group_namespace` on a `group_id`).
+        ttl_seconds: How long a cached result stays valid.
+    """
+
+    def decorator(fn: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            ns = namespace if isinstance(namespace, str) else namespace(args[0])
+            key = (ns, fn.__qualname__, args, tuple(kwargs.items()))
+            generation = _generations.get(ns, 0)
+            now = time.monotonic()
+
+            hit = _entries.get(key)
+            if hit is not None and hit[0] > now and hit[1] == generation:
+                return hit[2]  # type: ignore[return-value]
+
+            value = await fn(*args, **kwargs)
+            # Skip storing if the namespace was invalidated while the call ran.
+            if _generations.get(ns, 0) == generation:
+                if len(_entries) >= MAX_ENTRIES:
+                    _prune(now)
+                _entries[key] = (now + ttl_seconds, generation, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(*namespaces: str) -> None:
+    """Drop every cached result in the given namespaces."""
+    for ns in namespaces:
+        _generations[ns] = _generations.get(ns, 0) + 1
+
+
+def _prune(now: float) -> None:
+    for key in [k for k, (expires_at, _, _) in _entries.items() if expires_at <= now]:
+        del _entries[key]
+    if len(_entries) >= MAX_ENTRIES:
+        _entries.clear()
@@ -0,0 +1,42 @@
+"""Server-Sent Event framing helpers shared by the streaming routes."""
+
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import orjson
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
+from starlette.background import BackgroundTask
+
+PING_INTERVAL_SECONDS = 15
+SEND_TIMEOUT_SECONDS = 5.0
+
+
+def chunk_event(chunk: str) -> ServerSentEvent:
+    """Frame a response text chunk as a `chunk` event."""
+    return ServerSentEvent(chunk, event="chunk")
+
+
+def json_event(event: str, payload: dict[str, Any]) -> bytes:
+    """Encode a JSON-payload event to its final wire bytes.
+
+    `EventSourceResponse` passes bytes through untouched, so events built
+    here are encoded exactly once.
+    """
+    return ServerSentEvent(orjson.dumps(payload).decode(), event=event).encode()
+
+
+def event_source(events: AsyncGenerator[Any]) -> EventSourceResponse:
+    """Wrap an event generator in an `EventSourceResponse` that cleans up after itself.
+
+    On client disconnect the response cancels its send loop but leaves the
+    generator suspended until garbage collection, still holding its upstream
+    LLM stream. Closing it as a background task, once the response is done,
+    releases that stream immediately. Sends to a stalled client are bounded
+    by `SEND_TIMEOUT_SECONDS`.
+    """
+    return EventSourceResponse(
+        events,
+        ping=PING_INTERVAL_SECONDS,
+        send_timeout=SEND_TIMEOUT_SECONDS,
+        background=BackgroundTask(events.aclose),
+    )
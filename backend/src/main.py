@@ -2,10 +2,13 @@ from contextlib import asynccontextmanager
 from collections.abc import AsyncGenerator
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.core.database import init_database
+from src.core.database import database_lifespan
 from src.services import lightrag_service
+from src.services.health_service import health_lifespan
+from src.tools.ollama_client import ollama_lifespan
 from src.routes.conversations import router as conversations_router
 from src.routes.documents import router as documents_router
 from src.routes.groups import router as groups_router
@@ -15,9 +18,13 @@ from src.routes.query import router as query_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
-    await init_database()
-    yield
-    await lightrag_service.shutdown_all()
+    # Resources are nested so each one is torn down even if a later one fails,
+    # in reverse order of startup. Add new app-scoped resources as another level.
+    async with database_lifespan(), ollama_lifespan(), health_lifespan():
+        try:
+            yield
+        finally:
+            await lightrag_service.shutdown_all()
 
 
 app = FastAPI(
@@ -25,6 +32,7 @@ app = FastAPI(
     description="Knowledge graph RAG backend powered by LightRAG and Ollama",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
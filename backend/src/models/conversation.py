@@ -1,6 +1,6 @@
 from typing import Annotated, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from src.models.query import QueryMode
 
@@ -14,6 +14,8 @@ class ConversationCreate(BaseModel):
 class ConversationResponse(BaseModel):
     """Conversation metadata response."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: Annotated[str, Field(description="Unique conversation identifier")]
     group_id: Annotated[str, Field(description="Parent group identifier")]
     title: Annotated[str, Field(description="Conversation title")]
@@ -32,6 +34,9 @@ class ConversationListResponse(BaseModel):
 class MessageResponse(BaseModel):
     """Single chat message."""
 
+    # Messages are keyed by SQLite rowid; the API keeps exposing ids as strings.
+    model_config = ConfigDict(from_attributes=True, coerce_numbers_to_str=True)
+
     id: Annotated[str, Field(description="Unique message identifier")]
     conversation_id: Annotated[str, Field(description="Parent conversation identifier")]
     role: Annotated[Literal["user", "assistant"], Field(description="Message author role")]
@@ -58,4 +63,13 @@ class ConversationHistoryResponse(BaseModel):
     """Full conversation with all messages."""
 
     conversation: Annotated[ConversationResponse, Field(description="Conversation metadata")]
-    messages: Annotated[list[MessageResponse], Field(description="All messages in order")]
+    messages: Annotated[list[MessageResponse], Field(description="Messages in order (all, or the requested page)")]
+    # A message id, so a string like the ids themselves.
+    next_cursor: Annotated[
+        str | None,
+        Field(default=None, description="Pass as `before` to fetch older messages; null when none remain"),
+    ]
+
+
+CONVERSATION_LIST_ADAPTER = TypeAdapter(list[ConversationResponse])
+MESSAGE_LIST_ADAPTER = TypeAdapter(list[MessageResponse])
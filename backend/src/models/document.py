@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Annotated
 
 
@@ -12,6 +12,8 @@ class DocumentInsert(BaseModel):
 class DocumentResponse(BaseModel):
     """Document metadata response."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: Annotated[str, Field(description="Unique document identifier")]
     group_id: Annotated[str, Field(description="Parent group identifier")]
     filename: Annotated[str, Field(description="Source filename")]
@@ -24,3 +26,6 @@ class DocumentListResponse(BaseModel):
 
     documents: Annotated[list[DocumentResponse], Field(description="List of documents")]
     total: Annotated[int, Field(description="Total number of documents")]
+
+
+DOCUMENT_LIST_ADAPTER = TypeAdapter(list[DocumentResponse])
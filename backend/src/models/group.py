@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Annotated
 
 
@@ -19,6 +19,8 @@ class GroupUpdate(BaseModel):
 class GroupResponse(BaseModel):
     """Document group response."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: Annotated[str, Field(description="Unique group identifier")]
     name: Annotated[str, Field(description="Group name")]
     description: Annotated[str, Field(description="Group description")]
@@ -32,3 +34,6 @@ class GroupListResponse(BaseModel):
 
     groups: Annotated[list[GroupResponse], Field(description="List of groups")]
     total: Annotated[int, Field(description="Total number of groups")]
+
+
+GROUP_LIST_ADAPTER = TypeAdapter(list[GroupResponse])
@@ -0,0 +1,58 @@
+"""Slot-based row types for the hot list queries.
+
+Each dataclass mirrors the column order of one SELECT shape, so a cursor
+row factory builds it with a single tuple unpack instead of going through
+`aiosqlite.Row`. Response models read them via `from_attributes`.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Self
+
+
+class _Row:
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, _cursor: sqlite3.Cursor, row: tuple) -> Self:
+        """Cursor row factory: unpack a raw row tuple into the dataclass."""
+        return cls(*row)
+
+
+@dataclass(slots=True, frozen=True)
+class GroupRow(_Row):
+    id: str
+    name: str
+    description: str
+    created_at: str
+    updated_at: str
+    document_count: int
+
+
+@dataclass(slots=True, frozen=True)
+class DocumentRow(_Row):
+    id: str
+    group_id: str
+    filename: str
+    content_length: int
+    created_at: str
+
+
+@dataclass(slots=True, frozen=True)
+class ConversationRow(_Row):
+    id: str
+    group_id: str
+    title: str
+    created_at: str
+    updated_at: str
+    message_count: int
+
+
+@dataclass(slots=True, frozen=True)
+class MessageRow(_Row):
+    id: int
+    conversation_id: str
+    role: str
+    content: str
+    query_mode: str | None
+    created_at: str
@@ -1,10 +1,12 @@
-import json
+from contextlib import aclosing
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import Response
 from sse_starlette.sse import EventSourceResponse
 
 from src.core.exceptions import ConversationNotFoundError, GroupNotFoundError, LightRAGNotReadyError
+from src.lib.sse import chunk_event, event_source, json_event
 from src.models.conversation import (
     ChatRequest,
     ChatResponse,
@@ -37,10 +39,23 @@ async def list_conversations(group_id: str) -> ConversationListResponse:
 
 
 @router.get("/{conversation_id}")
-async def get_conversation(group_id: str, conversation_id: str) -> ConversationHistoryResponse:
-    """Get a conversation with its full message history."""
+async def get_conversation(
+    group_id: str,
+    conversation_id: str,
+    before: Annotated[
+        str | None,
+        Query(pattern=r"^[1-9][0-9]*$", description="Only return messages older than this message id"),
+    ] = None,
+    limit: Annotated[int | None, Query(ge=1, le=500, description="Page size; omit for the full history")] = None,
+) -> ConversationHistoryResponse:
+    """Get a conversation with its message history.
+
+    Without `limit` the full history is returned. With `limit`, the most recent
+    messages (older than `before`, if given) are returned and `next_cursor`
+    points at the previous page.
+    """
     try:
-        return await conversation_service.get_conversation_history(group_id, conversation_id)
+        return await conversation_service.get_conversation_history(group_id, conversation_id, before, limit)
     except GroupNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ConversationNotFoundError as e:
@@ -74,26 +89,25 @@ async def chat_stream(group_id: str, conversation_id: str, data: ChatRequest) ->
 
     The user message is saved immediately. The assistant response is saved after streaming completes.
     """
+    done_event = json_event(
+        "done",
+        {"group_id": group_id, "conversation_id": conversation_id, "mode": data.mode},
+    )
+
     async def event_generator():
         try:
-            async for chunk in conversation_service.chat_stream(
-                group_id, conversation_id, data.message, data.mode
-            ):
-                yield {"event": "chunk", "data": chunk}
-            yield {
-                "event": "done",
-                "data": json.dumps({
-                    "group_id": group_id,
-                    "conversation_id": conversation_id,
-                    "mode": data.mode,
-                }),
-            }
+            async with aclosing(
+                conversation_service.chat_stream(group_id, conversation_id, data.message, data.mode)
+            ) as stream:
+                async for chunk in stream:
+                    yield chunk_event(chunk)
+            yield done_event
         except (GroupNotFoundError, ConversationNotFoundError) as e:
-            yield {"event": "error", "data": json.dumps({"detail": str(e)})}
+            yield json_event("error", {"detail": str(e)})
         except LightRAGNotReadyError as e:
-            yield {"event": "error", "data": json.dumps({"detail": str(e)})}
+            yield json_event("error", {"detail": str(e)})
 
-    return EventSourceResponse(event_generator())
+    return event_source(event_generator())
 
 
 @router.delete("/{conversation_id}", status_code=204)
@@ -3,7 +3,7 @@ from fastapi import APIRouter, HTTPException, UploadFile
 from src.core.exceptions import DocumentNotFoundError, GroupNotFoundError, LightRAGNotReadyError
 from src.models.document import DocumentInsert, DocumentListResponse, DocumentResponse
 from src.services import document_service
-from src.tools.text_extractor import extract_text
+from src.tools.text_extractor import extract_text_async
 
 router = APIRouter(prefix="/groups/{group_id}/documents", tags=["Documents"])
 
@@ -32,7 +32,7 @@ async def upload_file(group_id: str, file: UploadFile) -> DocumentResponse:
     try:
         content_bytes = await file.read()
         filename = file.filename or "uploaded_file.txt"
-        text = extract_text(content_bytes, filename)
+        text = await extract_text_async(content_bytes, filename)
         return await document_service.insert_document(group_id, text, filename)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,10 +1,11 @@
-import json
+from contextlib import aclosing
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import Response
 from sse_starlette.sse import EventSourceResponse
 
 from src.core.exceptions import GroupNotFoundError, LightRAGNotReadyError
+from src.lib.sse import chunk_event, event_source, json_event
 from src.models.query import QueryRequest, QueryResponse
 from src.services import query_service
 
@@ -39,14 +40,17 @@ async def query_group_stream(group_id: str, data: QueryRequest) -> EventSourceRe
     - `event: done` / `data: {"query", "mode", "group_id"}` — stream complete
     - `event: error` / `data: {"detail": "..."}` — error occurred
     """
+    done_event = json_event("done", {"query": data.query, "mode": data.mode, "group_id": group_id})
+
     async def event_generator():
         try:
-            async for chunk in query_service.query_group_stream(group_id, data.query, data.mode):
-                yield {"event": "chunk", "data": chunk}
-            yield {"event": "done", "data": json.dumps({"query": data.query, "mode": data.mode, "group_id": group_id})}
+            async with aclosing(query_service.query_group_stream(group_id, data.query, data.mode)) as stream:
+                async for chunk in stream:
+                    yield chunk_event(chunk)
+            yield done_event
         except GroupNotFoundError as e:
-            yield {"event": "error", "data": json.dumps({"detail": str(e)})}
+            yield json_event("error", {"detail": str(e)})
         except LightRAGNotReadyError as e:
-            yield {"event": "error", "data": json.dumps({"detail": str(e)})}
+            yield json_event("error", {"detail": str(e)})
 
-    return EventSourceResponse(event_generator())
+    return event_source(event_generator())
@@ -1,9 +1,19 @@
-import uuid
+import asyncio
+import secrets
+from collections import OrderedDict, deque
 from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from operator import attrgetter
 
-from src.core.database import get_connection
-from src.core.exceptions import ConversationNotFoundError, GroupNotFoundError
+import aiosqlite
+from lightrag import QueryParam
+
+from src.core.database import acquire_reader, acquire_writer
+from src.core.exceptions import ConversationNotFoundError
+from src.lib.cache import cached, group_namespace, invalidate
 from src.models.conversation import (
+    CONVERSATION_LIST_ADAPTER,
+    MESSAGE_LIST_ADAPTER,
     ChatResponse,
     ConversationCreate,
     ConversationHistoryResponse,
@@ -11,34 +21,72 @@ from src.models.conversation import (
     ConversationResponse,
     MessageResponse,
 )
+from src.models.rows import ConversationRow, MessageRow
 from src.services import lightrag_service
+from src.services.group_service import group_must_exist, verify_group_exists
+
+MAX_ROWID = 2**63 - 1
+
+# Recent turns passed to LightRAG as conversation history, kept in memory
+# per conversation and appended to as messages are committed. Every turn
+# then sends the same prefix as the previous one plus the new messages,
+# which keeps the LLM's prompt cache warm and skips a query per turn.
+HISTORY_TURNS = 5
+HISTORY_CACHE_SIZE = 256
+
+_history_cache: OrderedDict[str, deque[dict[str, str]]] = OrderedDict()
+
+# Strong references to shielded write-backs that outlive a cancelled stream.
+_pending_writes: set[asyncio.Task[None]] = set()
+
+# Statements run on every chat turn. sqlite3 caches prepared statements by
+# SQL text, so each lives in exactly one place: an edit to one copy of an
+# inline literal would silently prepare a second statement.
+GET_CONVERSATION_SQL = "SELECT * FROM conversations WHERE id = ? AND group_id = ?"
+
+# The inner query takes the newest turns off the index; the outer one
+# puts them back in chronological order.
+RECENT_HISTORY_SQL = """
+SELECT role, content FROM (
+    SELECT id, role, content FROM messages
+    WHERE conversation_id = ?
+    ORDER BY id DESC
+    LIMIT ?
+)
+ORDER BY id
+"""
 
+INSERT_TURN_SQL = """
+INSERT INTO messages (conversation_id, role, content, query_mode)
+VALUES (?, 'user', ?, NULL), (?, 'assistant', ?, ?)
+RETURNING id, conversation_id, role, content, query_mode, created_at
+"""
 
-async def _verify_group_exists(group_id: str) -> None:
-    db = await get_connection()
-    try:
-        cursor = await db.execute("SELECT id FROM groups WHERE id = ?", (group_id,))
-        if not await cursor.fetchone():
-            raise GroupNotFoundError(f"Group '{group_id}' not found")
-    finally:
-        await db.close()
+INSERT_MESSAGE_SQL = "INSERT INTO messages (conversation_id, role, content, query_mode) VALUES (?, ?, ?, ?)"
 
 
-async def _get_conversation_row(group_id: str, conversation_id: str) -> dict:
-    db = await get_connection()
-    try:
-        cursor = await db.execute(
-            "SELECT * FROM conversations WHERE id = ? AND group_id = ?",
-            (conversation_id, group_id),
-        )
-        row = await cursor.fetchone()
-        if not row:
-            raise ConversationNotFoundError(
-                f"Conversation '{conversation_id}' not found in group '{group_id}'"
-            )
-        return dict(row)
-    finally:
-        await db.close()
+# The helpers below run on the caller's connection, so a request does its
+# checks and reads on one pooled handle instead of acquiring one per step.
+
+
+async def _get_conversation_row(db: aiosqlite.Connection, group_id: str, conversation_id: str) -> dict:
+    cursor = await db.execute(GET_CONVERSATION_SQL, (conversation_id, group_id))
+    row = await cursor.fetchone()
+    if not row:
+        raise await _conversation_not_found(db, group_id, conversation_id)
+    return dict(row)
+
+
+async def _conversation_not_found(
+    db: aiosqlite.Connection, group_id: str, conversation_id: str
+) -> ConversationNotFoundError:
+    """Explain a conversation lookup miss, checking the group only on this path.
+
+    Raises:
+        GroupNotFoundError: If the miss is because the group does not exist.
+    """
+    await verify_group_exists(group_id, db)
+    return ConversationNotFoundError(f"Conversation '{conversation_id}' not found in group '{group_id}'")
 
 
 async def create_conversation(group_id: str, data: ConversationCreate) -> ConversationResponse:
@@ -54,31 +102,21 @@ async def create_conversation(group_id: str, data: ConversationCreate) -> Conver
     Raises:
         GroupNotFoundError: If the group does not exist.
     """
-    await _verify_group_exists(group_id)
-
-    conv_id = uuid.uuid4().hex[:12]
-    db = await get_connection()
-    try:
-        await db.execute(
-            "INSERT INTO conversations (id, group_id, title) VALUES (?, ?, ?)",
-            (conv_id, group_id, data.title),
-        )
-        await db.commit()
-
-        cursor = await db.execute("SELECT * FROM conversations WHERE id = ?", (conv_id,))
+    conv_id = secrets.token_hex(6)
+    async with acquire_writer() as db:
+        await verify_group_exists(group_id, db)
+        with group_must_exist(group_id):
+            cursor = await db.execute(
+                "INSERT INTO conversations (id, group_id, title) VALUES (?, ?, ?) RETURNING *",
+                (conv_id, group_id, data.title),
+            )
         row = await cursor.fetchone()
-        return ConversationResponse(
-            id=row["id"],
-            group_id=row["group_id"],
-            title=row["title"],
-            message_count=0,
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
-    finally:
-        await db.close()
+
+    invalidate(group_namespace(group_id))
+    return ConversationResponse.model_validate(dict(row))
 
 
+@cached(group_namespace)
 async def list_conversations(group_id: str) -> ConversationListResponse:
     """List all conversations in a group.
 
@@ -91,115 +129,131 @@ async def list_conversations(group_id: str) -> ConversationListResponse:
     Raises:
         GroupNotFoundError: If the group does not exist.
     """
-    await _verify_group_exists(group_id)
-
-    db = await get_connection()
-    try:
+    async with acquire_reader() as db:
+        await verify_group_exists(group_id, db)
         cursor = await db.execute(
             """
-            SELECT c.*, COUNT(m.id) as msg_count
+            SELECT c.id, c.group_id, c.title, c.created_at, c.updated_at,
+                   (SELECT COUNT(*) FROM messages m WHERE m.conversation_id = c.id) AS message_count
             FROM conversations c
-            LEFT JOIN messages m ON m.conversation_id = c.id
             WHERE c.group_id = ?
-            GROUP BY c.id
             ORDER BY c.updated_at DESC
             """,
             (group_id,),
         )
+        cursor.row_factory = ConversationRow.from_row
         rows = await cursor.fetchall()
-        conversations = [
-            ConversationResponse(
-                id=row["id"],
-                group_id=row["group_id"],
-                title=row["title"],
-                message_count=row["msg_count"],
-                created_at=row["created_at"],
-                updated_at=row["updated_at"],
-            )
-            for row in rows
-        ]
-        return ConversationListResponse(conversations=conversations, total=len(conversations))
-    finally:
-        await db.close()
+        conversations = CONVERSATION_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+        return ConversationListResponse.model_construct(conversations=conversations, total=len(conversations))
 
 
-async def get_conversation_history(group_id: str, conversation_id: str) -> ConversationHistoryResponse:
-    """Get a conversation with all its messages.
+@cached(group_namespace)
+async def get_conversation_history(
+    group_id: str,
+    conversation_id: str,
+    before: str | None = None,
+    limit: int | None = None,
+) -> ConversationHistoryResponse:
+    """Get a conversation with its messages, optionally one page at a time.
 
     Args:
         group_id: The group identifier.
         conversation_id: The conversation identifier.
+        before: Only return messages older than this message id.
+        limit: Return at most this many of the most recent matching messages.
 
     Returns:
-        ConversationHistoryResponse with metadata and all messages.
+        ConversationHistoryResponse with metadata and messages in order, plus
+        a `next_cursor` when older messages remain.
 
     Raises:
         GroupNotFoundError: If the group does not exist.
         ConversationNotFoundError: If the conversation does not exist.
     """
-    await _verify_group_exists(group_id)
-    conv_row = await _get_conversation_row(group_id, conversation_id)
-
-    db = await get_connection()
-    try:
+    # The full history is already a count of itself; only a page needs the
+    # COUNT, and CASE skips evaluating the subquery otherwise.
+    paged = before is not None or limit is not None
+    async with acquire_reader() as db:
         cursor = await db.execute(
-            "SELECT COUNT(*) as cnt FROM messages WHERE conversation_id = ?",
-            (conversation_id,),
+            """
+            SELECT c.*,
+                   CASE WHEN ? THEN (SELECT COUNT(*) FROM messages m WHERE m.conversation_id = c.id) END
+                       AS message_count
+            FROM conversations c
+            WHERE c.id = ? AND c.group_id = ?
+            """,
+            (paged, conversation_id, group_id),
         )
-        count_row = await cursor.fetchone()
+        conv_row = await cursor.fetchone()
+        if not conv_row:
+            raise await _conversation_not_found(db, group_id, conversation_id)
 
+        # Newest first so LIMIT bounds the index range scan; one extra row
+        # tells whether an older page exists. LIMIT -1 means no limit.
         cursor = await db.execute(
-            "SELECT * FROM messages WHERE conversation_id = ? ORDER BY created_at ASC",
-            (conversation_id,),
+            """
+            SELECT id, conversation_id, role, content, query_mode, created_at
+            FROM messages
+            WHERE conversation_id = ? AND id < ?
+            ORDER BY id DESC
+            LIMIT ?
+            """,
+            (
+                conversation_id,
+                min(int(before), MAX_ROWID) if before is not None else MAX_ROWID,
+                limit + 1 if limit is not None else -1,
+            ),
         )
+        cursor.row_factory = MessageRow.from_row
         msg_rows = await cursor.fetchall()
 
-        conversation = ConversationResponse(
-            id=conv_row["id"],
-            group_id=conv_row["group_id"],
-            title=conv_row["title"],
-            message_count=count_row["cnt"],
-            created_at=conv_row["created_at"],
-            updated_at=conv_row["updated_at"],
-        )
-        messages = [
-            MessageResponse(
-                id=row["id"],
-                conversation_id=row["conversation_id"],
-                role=row["role"],
-                content=row["content"],
-                query_mode=row["query_mode"],
-                created_at=row["created_at"],
-            )
-            for row in msg_rows
-        ]
-        return ConversationHistoryResponse(conversation=conversation, messages=messages)
-    finally:
-        await db.close()
+    next_cursor = None
+    if limit is not None and len(msg_rows) > limit:
+        del msg_rows[limit:]
+        next_cursor = str(msg_rows[-1].id)
+    msg_rows.reverse()
+
+    conversation = ConversationResponse.model_validate(
+        {**conv_row, "message_count": conv_row["message_count"] if paged else len(msg_rows)}
+    )
+    messages = MESSAGE_LIST_ADAPTER.validate_python(msg_rows, from_attributes=True)
+    return ConversationHistoryResponse.model_construct(
+        conversation=conversation, messages=messages, next_cursor=next_cursor
+    )
 
 
-async def _get_history_for_lightrag(conversation_id: str, max_turns: int = 5) -> list[dict[str, str]]:
-    """Build conversation history in the format LightRAG expects."""
-    db = await get_connection()
-    try:
-        cursor = await db.execute(
-            """
-            SELECT role, content FROM messages
-            WHERE conversation_id = ?
-            ORDER BY created_at DESC
-            LIMIT ?
-            """,
-            (conversation_id, max_turns * 2),
-        )
-        rows = await cursor.fetchall()
-        return [{"role": row["role"], "content": row["content"]} for row in reversed(rows)]
-    finally:
-        await db.close()
+async def _get_history_for_lightrag(db: aiosqlite.Connection, conversation_id: str) -> list[dict[str, str]]:
+    """Build conversation history in the format LightRAG expects, loading it on a cache miss."""
+    history = _history_cache.get(conversation_id)
+    if history is not None:
+        _history_cache.move_to_end(conversation_id)
+        return list(history)
+
+    cursor = await db.execute(RECENT_HISTORY_SQL, (conversation_id, HISTORY_TURNS * 2))
+    rows = await cursor.fetchall()
+    history = deque(
+        ({"role": row["role"], "content": row["content"]} for row in rows),
+        maxlen=HISTORY_TURNS * 2,
+    )
+    _history_cache[conversation_id] = history
+    if len(_history_cache) > HISTORY_CACHE_SIZE:
+        _history_cache.popitem(last=False)
+    return list(history)
+
+
+def _remember(conversation_id: str, *messages: dict[str, str]) -> None:
+    """Append committed messages to the cached history, if the conversation is cached."""
+    history = _history_cache.get(conversation_id)
+    if history is not None:
+        history.extend(messages)
 
 
 async def chat(group_id: str, conversation_id: str, message: str, mode: str = "mix") -> ChatResponse:
     """Send a message in a conversation and get a RAG-powered response.
 
+    The user and assistant messages are written together in one transaction
+    once the response is generated, so a failed generation persists nothing.
+
     Args:
         group_id: The group identifier.
         conversation_id: The conversation identifier.
@@ -213,68 +267,35 @@ async def chat(group_id: str, conversation_id: str, message: str, mode: str = "m
         GroupNotFoundError: If the group does not exist.
         ConversationNotFoundError: If the conversation does not exist.
     """
-    await _verify_group_exists(group_id)
-    await _get_conversation_row(group_id, conversation_id)
-
-    user_msg_id = uuid.uuid4().hex[:12]
-    assistant_msg_id = uuid.uuid4().hex[:12]
-
-    db = await get_connection()
-    try:
-        await db.execute(
-            "INSERT INTO messages (id, conversation_id, role, content) VALUES (?, ?, 'user', ?)",
-            (user_msg_id, conversation_id, message),
+    async with acquire_reader() as db:
+        await _get_conversation_row(db, group_id, conversation_id)
+        history = await _get_history_for_lightrag(db, conversation_id)
+
+    async with lightrag_service.use_instance(group_id) as rag:
+        response = await rag.aquery(
+            message,
+            param=QueryParam(mode=mode, conversation_history=history),
         )
-        await db.commit()
-    finally:
-        await db.close()
-
-    history = await _get_history_for_lightrag(conversation_id)
 
-    rag = await lightrag_service.get_instance(group_id)
-    from lightrag import QueryParam
-    response = await rag.aquery(
-        message,
-        param=QueryParam(mode=mode, conversation_history=history),
-    )
-
-    db = await get_connection()
-    try:
-        await db.execute(
-            "INSERT INTO messages (id, conversation_id, role, content, query_mode) VALUES (?, ?, 'assistant', ?, ?)",
-            (assistant_msg_id, conversation_id, response, mode),
-        )
-        await db.execute(
-            "UPDATE conversations SET updated_at = datetime('now') WHERE id = ?",
-            (conversation_id,),
-        )
-        await db.commit()
-
-        user_cursor = await db.execute("SELECT * FROM messages WHERE id = ?", (user_msg_id,))
-        user_row = await user_cursor.fetchone()
-        asst_cursor = await db.execute("SELECT * FROM messages WHERE id = ?", (assistant_msg_id,))
-        asst_row = await asst_cursor.fetchone()
-
-        return ChatResponse(
-            user_message=MessageResponse(
-                id=user_row["id"],
-                conversation_id=user_row["conversation_id"],
-                role=user_row["role"],
-                content=user_row["content"],
-                query_mode=user_row["query_mode"],
-                created_at=user_row["created_at"],
-            ),
-            assistant_message=MessageResponse(
-                id=asst_row["id"],
-                conversation_id=asst_row["conversation_id"],
-                role=asst_row["role"],
-                content=asst_row["content"],
-                query_mode=asst_row["query_mode"],
-                created_at=asst_row["created_at"],
-            ),
+    async with acquire_writer() as db:
+        cursor = await db.execute(
+            INSERT_TURN_SQL,
+            (conversation_id, message, conversation_id, response, mode),
         )
-    finally:
-        await db.close()
+        cursor.row_factory = MessageRow.from_row
+        # RETURNING order is unspecified; ids follow the VALUES order.
+        user_row, asst_row = sorted(await cursor.fetchall(), key=attrgetter("id"))
+
+    _remember(
+        conversation_id,
+        {"role": "user", "content": message},
+        {"role": "assistant", "content": response},
+    )
+    invalidate(group_namespace(group_id))
+    return ChatResponse(
+        user_message=MessageResponse.model_validate(user_row, from_attributes=True),
+        assistant_message=MessageResponse.model_validate(asst_row, from_attributes=True),
+    )
 
 
 async def chat_stream(
@@ -291,48 +312,41 @@ async def chat_stream(
     Yields:
         Response text chunks.
     """
-    await _verify_group_exists(group_id)
-    await _get_conversation_row(group_id, conversation_id)
-
-    user_msg_id = uuid.uuid4().hex[:12]
-    db = await get_connection()
-    try:
-        await db.execute(
-            "INSERT INTO messages (id, conversation_id, role, content) VALUES (?, ?, 'user', ?)",
-            (user_msg_id, conversation_id, message),
+    async with acquire_writer() as db:
+        await _get_conversation_row(db, group_id, conversation_id)
+        history = await _get_history_for_lightrag(db, conversation_id)
+        await db.execute(INSERT_MESSAGE_SQL, (conversation_id, "user", message, None))
+    _remember(conversation_id, {"role": "user", "content": message})
+    invalidate(group_namespace(group_id))
+
+    # Token-sized chunks: a bytearray holds only their UTF-8 bytes, where a
+    # list would keep a full str object per chunk until the final join.
+    response_buf = bytearray()
+    async with lightrag_service.use_instance(group_id) as rag:
+        result = await rag.aquery(
+            message,
+            param=QueryParam(mode=mode, stream=True, conversation_history=history),
         )
-        await db.commit()
-    finally:
-        await db.close()
-
-    history = await _get_history_for_lightrag(conversation_id)
-
-    rag = await lightrag_service.get_instance(group_id)
-    from lightrag import QueryParam
-    result = await rag.aquery(
-        message,
-        param=QueryParam(mode=mode, stream=True, conversation_history=history),
+        async with aclosing(result):
+            async for chunk in result:
+                response_buf += chunk.encode()
+                yield chunk
+
+    # The client may disconnect once it has the last chunk, cancelling this
+    # generator; shielding the write-back lets a finished answer still be saved.
+    persist = asyncio.create_task(
+        _save_assistant_message(group_id, conversation_id, response_buf.decode(), mode)
     )
+    _pending_writes.add(persist)
+    persist.add_done_callback(_pending_writes.discard)
+    await asyncio.shield(persist)
 
-    full_response = []
-    async for chunk in result:
-        full_response.append(chunk)
-        yield chunk
-
-    assistant_msg_id = uuid.uuid4().hex[:12]
-    db = await get_connection()
-    try:
-        await db.execute(
-            "INSERT INTO messages (id, conversation_id, role, content, query_mode) VALUES (?, ?, 'assistant', ?, ?)",
-            (assistant_msg_id, conversation_id, "".join(full_response), mode),
-        )
-        await db.execute(
-            "UPDATE conversations SET updated_at = datetime('now') WHERE id = ?",
-            (conversation_id,),
-        )
-        await db.commit()
-    finally:
-        await db.close()
+
+async def _save_assistant_message(group_id: str, conversation_id: str, response: str, mode: str) -> None:
+    async with acquire_writer() as db:
+        await db.execute(INSERT_MESSAGE_SQL, (conversation_id, "assistant", response, mode))
+    _remember(conversation_id, {"role": "assistant", "content": response})
+    invalidate(group_namespace(group_id))
 
 
 async def delete_conversation(group_id: str, conversation_id: str) -> None:
@@ -346,12 +360,8 @@ async def delete_conversation(group_id: str, conversation_id: str) -> None:
         GroupNotFoundError: If the group does not exist.
         ConversationNotFoundError: If the conversation does not exist.
     """
-    await _verify_group_exists(group_id)
-    await _get_conversation_row(group_id, conversation_id)
-
-    db = await get_connection()
-    try:
+    async with acquire_writer() as db:
+        await _get_conversation_row(db, group_id, conversation_id)
         await db.execute("DELETE FROM conversations WHERE id = ?", (conversation_id,))
-        await db.commit()
-    finally:
-        await db.close()
+    _history_cache.pop(conversation_id, None)
+    invalidate(group_namespace(group_id))
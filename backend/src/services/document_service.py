@@ -1,19 +1,24 @@
-import uuid
+import secrets
 
-from src.core.database import get_connection
-from src.core.exceptions import DocumentNotFoundError, GroupNotFoundError
-from src.models.document import DocumentListResponse, DocumentResponse
+import aiosqlite
+
+from src.core.database import acquire_reader, acquire_writer
+from src.core.exceptions import DocumentNotFoundError
+from src.lib.cache import GROUPS_NAMESPACE, cached, group_namespace, invalidate
+from src.models.document import DOCUMENT_LIST_ADAPTER, DocumentListResponse, DocumentResponse
+from src.models.rows import DocumentRow
 from src.services import lightrag_service
+from src.services.group_service import group_must_exist, verify_group_exists
+
 
+async def _document_not_found(db: aiosqlite.Connection, group_id: str, document_id: str) -> DocumentNotFoundError:
+    """Explain a document lookup miss, checking the group only on this path.
 
-async def _verify_group_exists(group_id: str) -> None:
-    db = await get_connection()
-    try:
-        cursor = await db.execute("SELECT id FROM groups WHERE id = ?", (group_id,))
-        if not await cursor.fetchone():
-            raise GroupNotFoundError(f"Group '{group_id}' not found")
-    finally:
-        await db.close()
+    Raises:
+        GroupNotFoundError: If the miss is because the group does not exist.
+    """
+    await verify_group_exists(group_id, db)
+    return DocumentNotFoundError(f"Document '{document_id}' not found in group '{group_id}'")
 
 
 async def insert_document(group_id: str, content: str, filename: str) -> DocumentResponse:
@@ -30,33 +35,26 @@ async def insert_document(group_id: str, content: str, filename: str) -> Documen
     Raises:
         GroupNotFoundError: If the group does not exist.
     """
-    await _verify_group_exists(group_id)
+    await verify_group_exists(group_id)
 
-    doc_id = f"doc-{uuid.uuid4().hex[:12]}"
+    doc_id = f"doc-{secrets.token_hex(6)}"
 
     await lightrag_service.insert_text(group_id, content, doc_id, filename)
 
-    db = await get_connection()
-    try:
-        await db.execute(
-            "INSERT INTO documents (id, group_id, filename, content_length) VALUES (?, ?, ?, ?)",
-            (doc_id, group_id, filename, len(content)),
-        )
-        await db.commit()
-
-        cursor = await db.execute("SELECT * FROM documents WHERE id = ?", (doc_id,))
+    async with acquire_writer() as db:
+        with group_must_exist(group_id):
+            cursor = await db.execute(
+                "INSERT INTO documents (id, group_id, filename, content_length) VALUES (?, ?, ?, ?) RETURNING *",
+                (doc_id, group_id, filename, len(content)),
+            )
         row = await cursor.fetchone()
-        return DocumentResponse(
-            id=row["id"],
-            group_id=row["group_id"],
-            filename=row["filename"],
-            content_length=row["content_length"],
-            created_at=row["created_at"],
-        )
-    finally:
-        await db.close()
+
+    # Document counts are part of the group responses.
+    invalidate(GROUPS_NAMESPACE, group_namespace(group_id))
+    return DocumentResponse.model_validate(dict(row))
 
 
+@cached(group_namespace)
 async def list_documents(group_id: str) -> DocumentListResponse:
     """List all documents in a group.
 
@@ -69,30 +67,24 @@ async def list_documents(group_id: str) -> DocumentListResponse:
     Raises:
         GroupNotFoundError: If the group does not exist.
     """
-    await _verify_group_exists(group_id)
-
-    db = await get_connection()
-    try:
+    async with acquire_reader() as db:
+        await verify_group_exists(group_id, db)
         cursor = await db.execute(
-            "SELECT * FROM documents WHERE group_id = ? ORDER BY created_at DESC",
+            """
+            SELECT id, group_id, filename, content_length, created_at
+            FROM documents
+            WHERE group_id = ?
+            ORDER BY created_at DESC
+            """,
             (group_id,),
         )
+        cursor.row_factory = DocumentRow.from_row
         rows = await cursor.fetchall()
-        documents = [
-            DocumentResponse(
-                id=row["id"],
-                group_id=row["group_id"],
-                filename=row["filename"],
-                content_length=row["content_length"],
-                created_at=row["created_at"],
-            )
-            for row in rows
-        ]
-        return DocumentListResponse(documents=documents, total=len(documents))
-    finally:
-        await db.close()
+        documents = DOCUMENT_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+        return DocumentListResponse.model_construct(documents=documents, total=len(documents))
 
 
+@cached(group_namespace)
 async def get_document(group_id: str, document_id: str) -> DocumentResponse:
     """Get a single document by ID.
 
@@ -107,26 +99,15 @@ async def get_document(group_id: str, document_id: str) -> DocumentResponse:
         GroupNotFoundError: If the group does not exist.
         DocumentNotFoundError: If the document does not exist.
     """
-    await _verify_group_exists(group_id)
-
-    db = await get_connection()
-    try:
+    async with acquire_reader() as db:
         cursor = await db.execute(
             "SELECT * FROM documents WHERE id = ? AND group_id = ?",
             (document_id, group_id),
         )
         row = await cursor.fetchone()
         if not row:
-            raise DocumentNotFoundError(f"Document '{document_id}' not found in group '{group_id}'")
-        return DocumentResponse(
-            id=row["id"],
-            group_id=row["group_id"],
-            filename=row["filename"],
-            content_length=row["content_length"],
-            created_at=row["created_at"],
-        )
-    finally:
-        await db.close()
+            raise await _document_not_found(db, group_id, document_id)
+        return DocumentResponse.model_validate(dict(row))
 
 
 async def delete_document(group_id: str, document_id: str) -> None:
@@ -140,26 +121,20 @@ async def delete_document(group_id: str, document_id: str) -> None:
         GroupNotFoundError: If the group does not exist.
         DocumentNotFoundError: If the document does not exist.
     """
-    await _verify_group_exists(group_id)
-
-    db = await get_connection()
-    try:
+    async with acquire_reader() as db:
         cursor = await db.execute(
             "SELECT id FROM documents WHERE id = ? AND group_id = ?",
             (document_id, group_id),
         )
         row = await cursor.fetchone()
         if not row:
-            raise DocumentNotFoundError(
-                f"Document '{document_id}' not found in group '{group_id}'"
-            )
+            raise await _document_not_found(db, group_id, document_id)
 
-        await lightrag_service.delete_document(group_id, document_id)
+    await lightrag_service.delete_document(group_id, document_id)
 
+    async with acquire_writer() as db:
         await db.execute(
             "DELETE FROM documents WHERE id = ? AND group_id = ?",
             (document_id, group_id),
         )
-        await db.commit()
-    finally:
-        await db.close()
+    invalidate(GROUPS_NAMESPACE, group_namespace(group_id))
@@ -1,12 +1,76 @@
-import uuid
+import asyncio
+import secrets
+import shutil
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
+import aiosqlite
+
 from src.core.config import settings
-from src.core.database import get_connection
+from src.core.database import acquire_reader, acquire_writer
 from src.core.exceptions import GroupAlreadyExistsError, GroupNotFoundError
-from src.models.group import GroupCreate, GroupListResponse, GroupResponse, GroupUpdate
+from src.lib.cache import GROUPS_NAMESPACE, cached, group_namespace, invalidate
+from src.models.group import GROUP_LIST_ADAPTER, GroupCreate, GroupListResponse, GroupResponse, GroupUpdate
+from src.models.rows import GroupRow
 from src.services import lightrag_service
 
+# Groups are created and deleted rarely but checked on nearly every request,
+# so confirmed ids are remembered. delete_group drops its entry and bumps
+# the deletion count while still holding the writer; a check that started
+# before that bump only records its result if the count is unchanged, so a
+# reader that saw the group just before it was deleted cannot re-add it.
+GROUP_EXISTS_TTL_SECONDS = 60.0
+
+_known_groups: dict[str, float] = {}
+_deletions = 0
+
+
+async def verify_group_exists(group_id: str, db: aiosqlite.Connection | None = None) -> None:
+    """Raise unless the group exists, skipping the query for recently confirmed ids.
+
+    Args:
+        group_id: The group identifier.
+        db: Connection to check on; a reader is acquired if omitted.
+
+    Raises:
+        GroupNotFoundError: If the group does not exist.
+    """
+    now = time.monotonic()
+    if _known_groups.get(group_id, 0.0) > now:
+        return
+
+    deletions = _deletions
+    if db is None:
+        async with acquire_reader() as db:
+            cursor = await db.execute("SELECT id FROM groups WHERE id = ?", (group_id,))
+            row = await cursor.fetchone()
+    else:
+        cursor = await db.execute("SELECT id FROM groups WHERE id = ?", (group_id,))
+        row = await cursor.fetchone()
+    if not row:
+        raise GroupNotFoundError(f"Group '{group_id}' not found")
+    if deletions == _deletions:
+        _known_groups[group_id] = now + GROUP_EXISTS_TTL_SECONDS
+
+
+@contextmanager
+def group_must_exist(group_id: str) -> Iterator[None]:
+    """Report a foreign key failure on a group's child row as a missing group.
+
+    Backstop for a group deleted between the existence check and the insert.
+
+    Raises:
+        GroupNotFoundError: If the insert referenced a group that no longer exists.
+    """
+    try:
+        yield
+    except aiosqlite.IntegrityError as e:
+        if "FOREIGN KEY" not in str(e):
+            raise
+        raise GroupNotFoundError(f"Group '{group_id}' not found") from e
+
 
 async def create_group(data: GroupCreate) -> GroupResponse:
     """Create a new document group with its own isolated storage directory.
@@ -20,68 +84,48 @@ async def create_group(data: GroupCreate) -> GroupResponse:
     Raises:
         GroupAlreadyExistsError: If a group with the same name exists.
     """
-    group_id = uuid.uuid4().hex[:12]
-    db = await get_connection()
-    try:
+    group_id = secrets.token_hex(6)
+    async with acquire_writer() as db:
         existing = await db.execute("SELECT id FROM groups WHERE name = ?", (data.name,))
         if await existing.fetchone():
             raise GroupAlreadyExistsError(f"Group '{data.name}' already exists")
 
-        await db.execute(
-            "INSERT INTO groups (id, name, description) VALUES (?, ?, ?)",
+        cursor = await db.execute(
+            "INSERT INTO groups (id, name, description) VALUES (?, ?, ?) RETURNING *",
             (group_id, data.name, data.description),
         )
-        await db.commit()
-
-        group_dir = Path(settings.data_dir) / "groups" / group_id
-        group_dir.mkdir(parents=True, exist_ok=True)
-
-        row = await db.execute("SELECT * FROM groups WHERE id = ?", (group_id,))
-        group = await row.fetchone()
-        return GroupResponse(
-            id=group["id"],
-            name=group["name"],
-            description=group["description"],
-            document_count=0,
-            created_at=group["created_at"],
-            updated_at=group["updated_at"],
-        )
-    finally:
-        await db.close()
+        group = await cursor.fetchone()
 
+    _known_groups[group_id] = time.monotonic() + GROUP_EXISTS_TTL_SECONDS
+    invalidate(GROUPS_NAMESPACE)
 
+    group_dir = Path(settings.data_dir) / "groups" / group_id
+    group_dir.mkdir(parents=True, exist_ok=True)
+
+    return GroupResponse.model_validate(dict(group))
+
+
+@cached(GROUPS_NAMESPACE)
 async def list_groups() -> GroupListResponse:
     """List all document groups with their document counts.
 
     Returns:
         GroupListResponse with all groups and total count.
     """
-    db = await get_connection()
-    try:
+    async with acquire_reader() as db:
         cursor = await db.execute("""
-            SELECT g.*, COUNT(d.id) as doc_count
+            SELECT g.id, g.name, g.description, g.created_at, g.updated_at,
+                   (SELECT COUNT(*) FROM documents d WHERE d.group_id = g.id) AS document_count
             FROM groups g
-            LEFT JOIN documents d ON d.group_id = g.id
-            GROUP BY g.id
             ORDER BY g.created_at DESC
         """)
+        cursor.row_factory = GroupRow.from_row
         rows = await cursor.fetchall()
-        groups = [
-            GroupResponse(
-                id=row["id"],
-                name=row["name"],
-                description=row["description"],
-                document_count=row["doc_count"],
-                created_at=row["created_at"],
-                updated_at=row["updated_at"],
-            )
-            for row in rows
-        ]
-        return GroupListResponse(groups=groups, total=len(groups))
-    finally:
-        await db.close()
+        groups = GROUP_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+        return GroupListResponse.model_construct(groups=groups, total=len(groups))
 
 
+@cached(GROUPS_NAMESPACE)
 async def get_group(group_id: str) -> GroupResponse:
     """Get a single document group by ID.
 
@@ -94,31 +138,19 @@ async def get_group(group_id: str) -> GroupResponse:
     Raises:
         GroupNotFoundError: If the group does not exist.
     """
-    db = await get_connection()
-    try:
+    async with acquire_reader() as db:
         cursor = await db.execute(
             """
-            SELECT g.*, COUNT(d.id) as doc_count
+            SELECT g.*, (SELECT COUNT(*) FROM documents d WHERE d.group_id = g.id) AS document_count
             FROM groups g
-            LEFT JOIN documents d ON d.group_id = g.id
             WHERE g.id = ?
-            GROUP BY g.id
             """,
             (group_id,),
         )
         row = await cursor.fetchone()
         if not row:
             raise GroupNotFoundError(f"Group '{group_id}' not found")
-        return GroupResponse(
-            id=row["id"],
-            name=row["name"],
-            description=row["description"],
-            document_count=row["doc_count"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
-    finally:
-        await db.close()
+        return GroupResponse.model_validate(dict(row))
 
 
 async def update_group(group_id: str, data: GroupUpdate) -> GroupResponse:
@@ -135,8 +167,7 @@ async def update_group(group_id: str, data: GroupUpdate) -> GroupResponse:
         GroupNotFoundError: If the group does not exist.
         GroupAlreadyExistsError: If the new name conflicts with an existing group.
     """
-    db = await get_connection()
-    try:
+    async with acquire_writer() as db:
         cursor = await db.execute("SELECT * FROM groups WHERE id = ?", (group_id,))
         existing = await cursor.fetchone()
         if not existing:
@@ -154,10 +185,8 @@ async def update_group(group_id: str, data: GroupUpdate) -> GroupResponse:
             "UPDATE groups SET name = ?, description = ?, updated_at = datetime('now') WHERE id = ?",
             (name, description, group_id),
         )
-        await db.commit()
-        return await get_group(group_id)
-    finally:
-        await db.close()
+    invalidate(GROUPS_NAMESPACE)
+    return await get_group(group_id)
 
 
 async def delete_group(group_id: str) -> None:
@@ -169,20 +198,20 @@ async def delete_group(group_id: str) -> None:
     Raises:
         GroupNotFoundError: If the group does not exist.
     """
-    db = await get_connection()
-    try:
+    global _deletions
+    async with acquire_writer() as db:
         cursor = await db.execute("SELECT id FROM groups WHERE id = ?", (group_id,))
         if not await cursor.fetchone():
             raise GroupNotFoundError(f"Group '{group_id}' not found")
 
         await db.execute("DELETE FROM groups WHERE id = ?", (group_id,))
-        await db.commit()
+        _deletions += 1
+        _known_groups.pop(group_id, None)
 
-        await lightrag_service.remove_instance(group_id)
+    invalidate(GROUPS_NAMESPACE, group_namespace(group_id))
+    await lightrag_service.remove_instance(group_id)
 
-        import shutil
-        group_dir = Path(settings.data_dir) / "groups" / group_id
-        if group_dir.exists():
-            shutil.rmtree(group_dir)
-    finally:
-        await db.close()
+    # A group's storage can hold many MB of vector and graph files; delete it
+    # on a worker thread so the event loop keeps serving other requests.
+    group_dir = Path(settings.data_dir) / "groups" / group_id
+    await asyncio.to_thread(shutil.rmtree, group_dir, ignore_errors=True)
@@ -1,9 +1,32 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from src.core.config import settings
 from src.models.health import HealthResponse
-from src.tools.ollama_client import list_running_models
+from src.tools.ollama_client import (
+    OllamaEmbeddingsRequest,
+    OllamaGenerateRequest,
+    list_running_models,
+    warmup_all,
+)
 
+logger = logging.getLogger(__name__)
 
-async def check_health() -> HealthResponse:
+# Probes may poll /health far more often than model state changes, so
+# requests are answered from the last probe result. A background task
+# keeps it fresh; a request only waits on Ollama when nothing is cached.
+HEALTH_REFRESH_SECONDS = 2.0
+
+_last: tuple[float, HealthResponse] | None = None
+_refresh_task: asyncio.Task[HealthResponse] | None = None
+_encoded: tuple[HealthResponse, bytes] | None = None
+
+
+async def _probe() -> HealthResponse:
     loaded_models: list[str] = []
     models_loaded = False
     try:
@@ -24,3 +47,86 @@ async def check_health() -> HealthResponse:
         models_loaded=models_loaded,
         loaded_models=loaded_models,
     )
+
+
+async def _refresh() -> HealthResponse:
+    global _last
+    health = await _probe()
+    _last = (time.monotonic(), health)
+    return health
+
+
+def _start_refresh() -> asyncio.Task[HealthResponse]:
+    """Start a probe unless one is already in flight, so concurrent callers share it."""
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh())
+    return _refresh_task
+
+
+async def check_health() -> HealthResponse:
+    """Return the latest health result, at most `HEALTH_REFRESH_SECONDS` stale.
+
+    A stale result is returned immediately while a refresh runs in the
+    background; only the very first call waits for a probe.
+    """
+    if _last is None:
+        return await asyncio.shield(_start_refresh())
+    checked_at, health = _last
+    if time.monotonic() - checked_at >= HEALTH_REFRESH_SECONDS:
+        _start_refresh()
+    return health
+
+
+async def check_health_json() -> bytes:
+    """Return the health check already encoded as a JSON body.
+
+    Health only changes when the set of loaded models does, so the last
+    encoded body is reused until the response differs from it.
+    """
+    global _encoded
+    health = await check_health()
+    if _encoded is None or _encoded[0] != health:
+        _encoded = (health, health.model_dump_json().encode())
+    return _encoded[1]
+
+
+async def _periodic_refresh() -> None:
+    while True:
+        await _start_refresh()
+        await asyncio.sleep(HEALTH_REFRESH_SECONDS)
+
+
+async def _warm_models() -> None:
+    """Load both models into Ollama, then refresh health so readiness shows at once."""
+    keep_alive = settings.ollama_keep_alive
+    results = await warmup_all(
+        settings.ollama_base_url,
+        [OllamaGenerateRequest(model=settings.ollama_model, prompt="ping", keep_alive=keep_alive)],
+        [OllamaEmbeddingsRequest(model=settings.ollama_embed_model, input="ping", keep_alive=keep_alive)],
+        settings.ollama_request_timeout_seconds,
+    )
+    for model, error in zip((settings.ollama_model, settings.ollama_embed_model), results, strict=True):
+        if error is not None:
+            logger.warning("Warmup failed for model '%s': %s", model, error)
+    _start_refresh()
+
+
+@asynccontextmanager
+async def health_lifespan() -> AsyncIterator[None]:
+    """Keep the cached health result refreshed for the duration of the block.
+
+    With `ollama_warmup` set, the models are also warmed in the background,
+    so startup does not wait on Ollama loading them.
+    """
+    tasks = [asyncio.create_task(_periodic_refresh())]
+    if settings.ollama_warmup:
+        tasks.append(asyncio.create_task(_warm_models()))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
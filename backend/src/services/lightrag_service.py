@@ -1,4 +1,9 @@
+import asyncio
 import logging
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import dataclass, field
 from functools import partial
 from pathlib import Path
 
@@ -11,31 +16,128 @@ from src.core.exceptions import GroupNotFoundError, LightRAGNotReadyError
 
 logger = logging.getLogger(__name__)
 
-_instances: dict[str, LightRAG] = {}
+# Each instance keeps its group's graph, vectors and KV stores in memory,
+# so only the most recently used groups stay loaded; the rest are finalized
+# and rebuilt from disk on their next request.
+MAX_INSTANCES = settings.max_cached_rag_instances
+
+_instances: OrderedDict[str, "_CachedInstance"] = OrderedDict()
+_init_locks: dict[str, asyncio.Lock] = {}
+# Finalizations of evicted instances still running, by group. A group
+# requested again waits for its old instance to finish flushing first.
+_evictions: dict[str, asyncio.Task[None]] = {}
+
+
+@dataclass(eq=False)
+class _CachedInstance:
+    """A cached LightRAG instance and the number of requests using it.
+
+    Only instances with no leases are evicted, so storages are never
+    finalized under a running insert or query, and a group never has a
+    second instance on its working directory while the first is in use.
+    """
+
+    rag: LightRAG
+    leases: int = 0
+    idle: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def __post_init__(self) -> None:
+        self.idle.set()
+
+    def acquire(self) -> None:
+        self.leases += 1
+        self.idle.clear()
+
+    def release(self) -> None:
+        self.leases -= 1
+        if self.leases == 0:
+            self.idle.set()
+            # Eviction skips leased instances, so the cache may have been
+            # left over its cap while this one was in use.
+            _evict_least_recent()
+
+
+# Model configuration is the same for every group, so it is built once and
+# shared. LightRAG only unpacks the kwargs, and copies the embedding func
+# (dataclasses.replace) before wrapping it in its per-instance rate limiter.
+_LLM_MODEL_KWARGS = {
+    "host": settings.ollama_base_url,
+    "options": {"num_ctx": settings.lightrag_context_window},
+    "timeout": settings.ollama_request_timeout_seconds,
+    "keep_alive": settings.ollama_keep_alive,
+}
+_EMBEDDING_FUNC = EmbeddingFunc(
+    embedding_dim=settings.lightrag_embedding_dim,
+    max_token_size=settings.lightrag_embedding_max_tokens,
+    func=partial(
+        ollama_embed.func,
+        embed_model=settings.ollama_embed_model,
+        host=settings.ollama_base_url,
+        timeout=settings.ollama_embed_timeout_seconds,
+        keep_alive=settings.ollama_keep_alive,
+    ),
+)
 
 
 def _group_dir(group_id: str) -> Path:
     return Path(settings.data_dir) / "groups" / group_id
 
 
-async def get_instance(group_id: str) -> LightRAG:
-    """Get or create a LightRAG instance for a specific group.
+@asynccontextmanager
+async def use_instance(group_id: str) -> AsyncIterator[LightRAG]:
+    """Use the LightRAG instance for a specific group, creating it if needed.
 
     Each group has its own isolated working directory with separate
-    knowledge graph, vector store, and KV storage.
+    knowledge graph, vector store, and KV storage. The instance is leased
+    for the duration of the block and is not evicted while leased.
 
     Args:
         group_id: The group identifier.
 
-    Returns:
+    Yields:
         Initialized LightRAG instance.
 
     Raises:
         GroupNotFoundError: If the group directory does not exist.
         LightRAGNotReadyError: If initialization fails.
     """
-    if group_id in _instances:
-        return _instances[group_id]
+    cached = await _acquire(group_id)
+    try:
+        yield cached.rag
+    finally:
+        cached.release()
+
+
+async def _acquire(group_id: str) -> _CachedInstance:
+    # Leases are taken without awaiting after the lookup, so an instance
+    # cannot be evicted between being found and being leased.
+    cached = _instances.get(group_id)
+    if cached is not None:
+        _instances.move_to_end(group_id)
+        cached.acquire()
+        return cached
+
+    # Initialization loads storages and can take seconds; concurrent first
+    # requests for a group wait on one lock instead of each building an
+    # instance and leaking all but the last.
+    lock = _init_locks.setdefault(group_id, asyncio.Lock())
+    async with lock:
+        cached = _instances.get(group_id)
+        if cached is None:
+            cached = await _create_instance(group_id)
+        else:
+            _instances.move_to_end(group_id)
+        cached.acquire()
+        _evict_least_recent()
+        return cached
+
+
+async def _create_instance(group_id: str) -> _CachedInstance:
+    # The group's previous instance, if evicted or removed, must finish
+    # flushing before another one opens the same working directory.
+    eviction = _evictions.get(group_id)
+    if eviction is not None:
+        await asyncio.shield(eviction)
 
     working_dir = _group_dir(group_id)
     if not working_dir.exists():
@@ -46,32 +148,64 @@ async def get_instance(group_id: str) -> LightRAG:
             working_dir=str(working_dir),
             llm_model_func=ollama_model_complete,
             llm_model_name=settings.ollama_model,
-            llm_model_kwargs={
-                "host": settings.ollama_base_url,
-                "options": {"num_ctx": settings.lightrag_context_window},
-                "timeout": settings.ollama_request_timeout_seconds,
-                "keep_alive": settings.ollama_keep_alive,
-            },
-            embedding_func=EmbeddingFunc(
-                embedding_dim=settings.lightrag_embedding_dim,
-                max_token_size=settings.lightrag_embedding_max_tokens,
-                func=partial(
-                    ollama_embed.func,
-                    embed_model=settings.ollama_embed_model,
-                    host=settings.ollama_base_url,
-                    timeout=settings.ollama_embed_timeout_seconds,
-                    keep_alive=settings.ollama_keep_alive,
-                ),
-            ),
+            llm_model_kwargs=_LLM_MODEL_KWARGS,
+            embedding_func=_EMBEDDING_FUNC,
         )
         await rag.initialize_storages()
-        _instances[group_id] = rag
-        logger.info("LightRAG instance initialized for group '%s'", group_id)
-        return rag
     except Exception as e:
         logger.error("Failed to initialize LightRAG for group '%s': %s", group_id, e)
         raise LightRAGNotReadyError(f"LightRAG initialization failed: {e}") from e
 
+    cached = _CachedInstance(rag)
+    _instances[group_id] = cached
+    logger.info("LightRAG instance initialized for group '%s'", group_id)
+    return cached
+
+
+def _evict_least_recent() -> None:
+    excess = len(_instances) - MAX_INSTANCES
+    if excess <= 0:
+        return
+    for group_id, cached in list(_instances.items()):
+        if excess == 0:
+            break
+        if cached.leases:
+            continue
+        del _instances[group_id]
+        excess -= 1
+        _init_locks.pop(group_id, None)
+        _retire(group_id, cached)
+        logger.info("LightRAG instance evicted for group '%s'", group_id)
+
+
+def _retire(group_id: str, cached: _CachedInstance) -> asyncio.Task[None]:
+    """Finalize an instance taken out of the cache once its leases are released.
+
+    The task is tracked in `_evictions` until it finishes, so a new instance
+    for the group waits for it.
+    """
+    task = asyncio.create_task(_finalize_when_idle(group_id, cached))
+    _evictions[group_id] = task
+
+    def forget(done: asyncio.Task[None]) -> None:
+        if _evictions.get(group_id) is done:
+            del _evictions[group_id]
+
+    task.add_done_callback(forget)
+    return task
+
+
+async def _finalize_when_idle(group_id: str, cached: _CachedInstance) -> None:
+    await cached.idle.wait()
+    await _finalize(group_id, cached.rag)
+
+
+async def _finalize(group_id: str, rag: LightRAG) -> None:
+    try:
+        await rag.finalize_storages()
+    except Exception as e:
+        logger.warning("Failed to finalize LightRAG for group '%s': %s", group_id, e)
+
 
 async def insert_text(
     group_id: str,
@@ -87,8 +221,8 @@ async def insert_text(
         document_id: Stable document identifier used for later deletions.
         file_path: Original filename for source tracking.
     """
-    rag = await get_instance(group_id)
-    await rag.ainsert(text, ids=document_id, file_paths=file_path)
+    async with use_instance(group_id) as rag:
+        await rag.ainsert(text, ids=document_id, file_paths=file_path)
     logger.info("Inserted %d chars into group '%s'", len(text), group_id)
 
 
@@ -103,9 +237,8 @@ async def query(group_id: str, query_text: str, mode: str = "mix") -> str:
     Returns:
         Generated response string.
     """
-    rag = await get_instance(group_id)
-    result = await rag.aquery(query_text, param=QueryParam(mode=mode))
-    return result
+    async with use_instance(group_id) as rag:
+        return await rag.aquery(query_text, param=QueryParam(mode=mode))
 
 
 async def query_stream(group_id: str, query_text: str, mode: str = "mix"):
@@ -119,31 +252,35 @@ async def query_stream(group_id: str, query_text: str, mode: str = "mix"):
     Yields:
         Response text chunks.
     """
-    rag = await get_instance(group_id)
-    result = await rag.aquery(query_text, param=QueryParam(mode=mode, stream=True))
-    async for chunk in result:
-        yield chunk
+    async with use_instance(group_id) as rag:
+        result = await rag.aquery(query_text, param=QueryParam(mode=mode, stream=True))
+        async with aclosing(result):
+            async for chunk in result:
+                yield chunk
 
 
 async def remove_instance(group_id: str) -> None:
     """Remove a cached LightRAG instance for a group.
 
+    Requests already using the instance finish before it is finalized.
+
     Args:
         group_id: The group identifier.
     """
-    if group_id in _instances:
-        rag = _instances.pop(group_id)
-        try:
-            await rag.finalize_storages()
-        except Exception:
-            pass
+    _init_locks.pop(group_id, None)
+    cached = _instances.pop(group_id, None)
+    if cached is not None:
+        await asyncio.shield(_retire(group_id, cached))
         logger.info("LightRAG instance removed for group '%s'", group_id)
 
 
 async def shutdown_all() -> None:
     """Finalize all cached LightRAG instances. Called on app shutdown."""
-    for group_id in list(_instances.keys()):
-        await remove_instance(group_id)
+    # The server has stopped taking requests, so leases are not waited on.
+    while _instances:
+        group_id, cached = _instances.popitem(last=False)
+        await _finalize(group_id, cached.rag)
+    await asyncio.gather(*_evictions.values())
     logger.info("All LightRAG instances shut down")
 
 
@@ -157,17 +294,17 @@ async def delete_document(group_id: str, document_id: str) -> None:
     Raises:
         LightRAGNotReadyError: If LightRAG rejects or fails deletion.
     """
-    rag = await get_instance(group_id)
-    try:
-        result = await rag.adelete_by_doc_id(document_id, delete_llm_cache=True)
-    except Exception as exc:
-        logger.error(
-            "Failed deleting document '%s' from group '%s': %s",
-            document_id,
-            group_id,
-            exc,
-        )
-        raise LightRAGNotReadyError(f"LightRAG document deletion failed: {exc}") from exc
+    async with use_instance(group_id) as rag:
+        try:
+            result = await rag.adelete_by_doc_id(document_id, delete_llm_cache=True)
+        except Exception as exc:
+            logger.error(
+                "Failed deleting document '%s' from group '%s': %s",
+                document_id,
+                group_id,
+                exc,
+            )
+            raise LightRAGNotReadyError(f"LightRAG document deletion failed: {exc}") from exc
 
     if result.status not in {"success", "not_found"}:
         logger.error(
@@ -1,19 +1,9 @@
 from collections.abc import AsyncGenerator
+from contextlib import aclosing
 
-from src.core.exceptions import GroupNotFoundError
-from src.core.database import get_connection
 from src.models.query import QueryResponse
 from src.services import lightrag_service
-
-
-async def _verify_group_exists(group_id: str) -> None:
-    db = await get_connection()
-    try:
-        cursor = await db.execute("SELECT id FROM groups WHERE id = ?", (group_id,))
-        if not await cursor.fetchone():
-            raise GroupNotFoundError(f"Group '{group_id}' not found")
-    finally:
-        await db.close()
+from src.services.group_service import verify_group_exists
 
 
 async def query_group(group_id: str, query_text: str, mode: str = "mix") -> QueryResponse:
@@ -30,7 +20,7 @@ async def query_group(group_id: str, query_text: str, mode: str = "mix") -> Quer
     Raises:
         GroupNotFoundError: If the group does not exist.
     """
-    await _verify_group_exists(group_id)
+    await verify_group_exists(group_id)
 
     response = await lightrag_service.query(group_id, query_text, mode)
     return QueryResponse(
@@ -55,7 +45,8 @@ async def query_group_stream(group_id: str, query_text: str, mode: str = "mix")
     Raises:
         GroupNotFoundError: If the group does not exist.
     """
-    await _verify_group_exists(group_id)
+    await verify_group_exists(group_id)
 
-    async for chunk in lightrag_service.query_stream(group_id, query_text, mode):
-        yield chunk
+    async with aclosing(lightrag_service.query_stream(group_id, query_text, mode)) as stream:
+        async for chunk in stream:
+            yield chunk
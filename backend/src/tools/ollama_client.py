@@ -1,36 +1,32 @@
 from __future__ import annotations
 
-from typing import Annotated
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Sequence
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Annotated, NotRequired, TypedDict
 
 import httpx
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
-class OllamaModelDetails(BaseModel):
-    parent_model: Annotated[str | None, Field(default=None)]
-    format: Annotated[str | None, Field(default=None)]
-    family: Annotated[str | None, Field(default=None)]
-    families: Annotated[list[str] | None, Field(default=None)]
-    parameter_size: Annotated[str | None, Field(default=None)]
-    quantization_level: Annotated[str | None, Field(default=None)]
+# list_running_models only reads each model's name, so /api/ps is validated
+# against just that field and the rest of every entry is skipped.
+class _RunningModelName(TypedDict):
+    model: str
 
 
-class OllamaRunningModel(BaseModel):
-    model: Annotated[str, Field(description="Model identifier with tag")]
-    name: Annotated[str | None, Field(default=None)]
-    size: Annotated[int | None, Field(default=None)]
-    digest: Annotated[str | None, Field(default=None)]
-    details: Annotated[OllamaModelDetails | None, Field(default=None)]
-    expires_at: Annotated[str | None, Field(default=None)]
-    size_vram: Annotated[int | None, Field(default=None)]
-    context_length: Annotated[int | None, Field(default=None)]
+class _PsModelNames(TypedDict):
+    models: NotRequired[list[_RunningModelName]]
 
 
-class OllamaPsResponse(BaseModel):
-    models: Annotated[list[OllamaRunningModel], Field(default_factory=list)]
+_PS_NAMES_ADAPTER = TypeAdapter(_PsModelNames)
 
 
 class OllamaGenerateRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     model: Annotated[str, Field(description="Model identifier with tag")]
     prompt: Annotated[str, Field(description="Prompt to warm the model")]
     stream: Annotated[bool, Field(default=False)]
@@ -38,17 +34,55 @@ class OllamaGenerateRequest(BaseModel):
 
 
 class OllamaEmbeddingsRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     model: Annotated[str, Field(description="Model identifier with tag")]
     input: Annotated[str, Field(description="Input text to warm the model")]
     keep_alive: Annotated[str | None, Field(default=None)]
 
 
+# One keep-alive connection pool shared by every Ollama call, so requests
+# reuse warm connections instead of opening a new client each time.
+KEEPALIVE_CONNECTIONS = 16
+
+_client: httpx.AsyncClient | None = None
+
+# Bodies are encoded with orjson rather than httpx's stdlib-json `json=`.
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@lru_cache(maxsize=64)
+def _encode_body(request: OllamaGenerateRequest | OllamaEmbeddingsRequest) -> bytes:
+    """Encode a request body once; warmups repeat a handful of frozen, hashable requests."""
+    return orjson.dumps(request.model_dump(exclude_none=True))
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=KEEPALIVE_CONNECTIONS))
+    return _client
+
+
+@asynccontextmanager
+async def ollama_lifespan() -> AsyncIterator[None]:
+    """Open the shared Ollama HTTP client for the duration of the block, then close it."""
+    global _client
+    _get_client()
+    try:
+        yield
+    finally:
+        client, _client = _client, None
+        if client is not None:
+            await client.aclose()
+
+
 async def list_running_models(base_url: str, timeout_seconds: int) -> list[str]:
-    async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-        response = await client.get(f"{base_url}/api/ps")
-        response.raise_for_status()
-        payload = OllamaPsResponse.model_validate(response.json())
-        return [model.model for model in payload.models]
+    response = await _get_client().get(f"{base_url}/api/ps", timeout=timeout_seconds)
+    response.raise_for_status()
+    payload = _PS_NAMES_ADAPTER.validate_json(response.content)
+    return [model["model"] for model in payload.get("models", ())]
 
 
 async def warmup_generate(
@@ -56,9 +90,13 @@ async def warmup_generate(
     request: OllamaGenerateRequest,
     timeout_seconds: int,
 ) -> None:
-    async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-        response = await client.post(f"{base_url}/api/generate", json=request.model_dump(exclude_none=True))
-        response.raise_for_status()
+    response = await _get_client().post(
+        f"{base_url}/api/generate",
+        content=_encode_body(request),
+        headers=JSON_HEADERS,
+        timeout=timeout_seconds,
+    )
+    response.raise_for_status()
 
 
 async def warmup_embeddings(
@@ -66,6 +104,36 @@ async def warmup_embeddings(
     request: OllamaEmbeddingsRequest,
     timeout_seconds: int,
 ) -> None:
-    async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-        response = await client.post(f"{base_url}/api/embed", json=request.model_dump(exclude_none=True))
-        response.raise_for_status()
+    response = await _get_client().post(
+        f"{base_url}/api/embed",
+        content=_encode_body(request),
+        headers=JSON_HEADERS,
+        timeout=timeout_seconds,
+    )
+    response.raise_for_status()
+
+
+async def warmup_all(
+    base_url: str,
+    generate_requests: Sequence[OllamaGenerateRequest],
+    embeddings_requests: Sequence[OllamaEmbeddingsRequest],
+    timeout_seconds: int,
+    max_concurrency: int = 4,
+) -> list[BaseException | None]:
+    """Run every warmup request concurrently, at most `max_concurrency` at a time.
+
+    Returns one entry per request, generate requests first: None on success,
+    or the exception that request raised, so one failed model does not
+    abort the others.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(call: Awaitable[None]) -> None:
+        async with semaphore:
+            await call
+
+    return await asyncio.gather(
+        *(bounded(warmup_generate(base_url, request, timeout_seconds)) for request in generate_requests),
+        *(bounded(warmup_embeddings(base_url, request, timeout_seconds)) for request in embeddings_requests),
+        return_exceptions=True,
+    )
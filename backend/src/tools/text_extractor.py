@@ -4,14 +4,15 @@ Each extractor handles a set of file extensions. New formats are added
 by writing a new extractor function and registering it in EXTRACTORS.
 """
 
+import asyncio
 from collections.abc import Callable
-from pathlib import Path
-
-import pymupdf
+from concurrent.futures import ThreadPoolExecutor
 
 
 def _extract_plaintext(content: bytes, _filename: str) -> str:
     """Extract text from plain-text encoded files (UTF-8 with Latin-1 fallback)."""
+    # No isascii() pre-check: the UTF-8 decoder already scans ASCII runs a
+    # word at a time, so a separate check only adds a second pass.
     try:
         return content.decode("utf-8")
     except UnicodeDecodeError:
@@ -20,13 +21,13 @@ def _extract_plaintext(content: bytes, _filename: str) -> str:
 
 def _extract_pdf(content: bytes, _filename: str) -> str:
     """Extract text from PDF files using PyMuPDF."""
-    doc = pymupdf.open(stream=content, filetype="pdf")
-    pages: list[str] = []
-    for page in doc:
-        text = page.get_text()
-        if text.strip():
-            pages.append(text)
-    doc.close()
+    # Imported on first use: the MuPDF extension is large, and text-only
+    # deployments never need it.
+    import pymupdf
+
+    with pymupdf.open(stream=content, filetype="pdf") as doc:
+        # isspace() answers "blank page?" without copying the page like strip().
+        pages = [text for page in doc if (text := page.get_text()) and not text.isspace()]
     return "\n".join(pages)
 
 
@@ -39,20 +40,47 @@ type ExtractorFn = Callable[[bytes, str], str]
 
 EXTRACTORS: dict[str, ExtractorFn] = {}
 
-_PLAINTEXT_EXTENSIONS = {
+_PLAINTEXT_EXTENSIONS = frozenset({
     ".txt", ".md", ".csv", ".json", ".xml", ".html",
     ".py", ".js", ".ts", ".yaml", ".yml", ".log",
-}
+})
 
 for _ext in _PLAINTEXT_EXTENSIONS:
     EXTRACTORS[_ext] = _extract_plaintext
 
 EXTRACTORS[".pdf"] = _extract_pdf
 
+# Extractors that parse a document format (100 ms to seconds per file)
+# rather than just decode bytes; extract_text_async runs these off the
+# event loop so one upload does not stall every other request. PyMuPDF
+# does not support multithreading, even with one Document per thread, so
+# they share a single worker thread and PDF parses are serialized.
+THREADED_EXTRACTORS: frozenset[ExtractorFn] = frozenset({_extract_pdf})
+
+_parser_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="text-extractor")
+
 # Future: EXTRACTORS[".docx"] = _extract_docx
 # Future: EXTRACTORS[".xlsx"] = _extract_xlsx
 
-SUPPORTED_EXTENSIONS = set(EXTRACTORS.keys())
+SUPPORTED_EXTENSIONS = frozenset(EXTRACTORS)
+_SUPPORTED_LIST = ", ".join(sorted(SUPPORTED_EXTENSIONS))
+
+
+def _extension(filename: str) -> str:
+    """Lowercased suffix of the final path component, as `Path(filename).suffix` gives it."""
+    name = filename.rpartition("/")[2]
+    dot = name.rfind(".")
+    if dot <= 0 or dot == len(name) - 1:
+        return ""
+    return name[dot:].lower()
+
+
+def _get_extractor(filename: str) -> ExtractorFn:
+    ext = _extension(filename)
+    extractor = EXTRACTORS.get(ext)
+    if extractor is None:
+        raise ValueError(f"Unsupported file type '{ext}'. Supported: {_SUPPORTED_LIST}")
+    return extractor
 
 
 def extract_text(content: bytes, filename: str) -> str:
@@ -68,10 +96,23 @@ def extract_text(content: bytes, filename: str) -> str:
     Raises:
         ValueError: If the file type is not supported.
     """
-    ext = Path(filename).suffix.lower()
-    extractor = EXTRACTORS.get(ext)
-    if extractor is None:
-        raise ValueError(
-            f"Unsupported file type '{ext}'. Supported: {', '.join(sorted(SUPPORTED_EXTENSIONS))}"
-        )
+    return _get_extractor(filename)(content, filename)
+
+
+async def extract_text_async(content: bytes, filename: str) -> str:
+    """Extract text like `extract_text`, running document parsers one at a time on a worker thread.
+
+    Args:
+        content: Raw file bytes.
+        filename: Original filename for extension detection.
+
+    Returns:
+        Extracted text string.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    extractor = _get_extractor(filename)
+    if extractor in THREADED_EXTRACTORS:
+        return await asyncio.get_running_loop().run_in_executor(_parser_executor, extractor, content, filename)
     return extractor(content, filename)
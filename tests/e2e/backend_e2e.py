@@ -17,14 +17,39 @@ from __future__ import annotations
 import argparse
 import http.client
 import json
+import select
+import socket
 import sys
+import threading
 import time
-import urllib.error
-import urllib.request
 import uuid
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
+from urllib.parse import urlsplit
+
+T = TypeVar("T")
+
+# Independent requests within a step (the two groups, the five query
+# modes, ...) are sent concurrently; the backend serves them in parallel.
+MAX_PARALLEL_REQUESTS = 8
+
+# Files attached as a Path are streamed from disk in chunks of this size
+# rather than read into memory and copied into the request body.
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Shared by every JSON request; http.client only reads the headers it is given.
+JSON_HEADERS = {"Content-Type": "application/json"}
+SSE_HEADERS = {**JSON_HEADERS, "Accept": "text/event-stream"}
+
+# SSE event names the backend emits. Parsed names are interned, so
+# comparing them against these constants short-circuits on identity.
+EVENT_CHUNK = sys.intern("chunk")
+EVENT_DONE = sys.intern("done")
+EVENT_ERROR = sys.intern("error")
 
 
 class E2EError(RuntimeError):
@@ -44,6 +69,23 @@ class TestState:
 class BackendE2ETester:
     """Runs a full backend verification flow with bounded request timeouts."""
 
+    REQUIRED_PATHS = frozenset(
+        {
+            "/health",
+            "/groups",
+            "/groups/{group_id}",
+            "/groups/{group_id}/documents",
+            "/groups/{group_id}/documents/upload",
+            "/groups/{group_id}/documents/{document_id}",
+            "/groups/{group_id}/query",
+            "/groups/{group_id}/query/stream",
+            "/groups/{group_id}/conversations",
+            "/groups/{group_id}/conversations/{conversation_id}",
+            "/groups/{group_id}/conversations/{conversation_id}/chat",
+            "/groups/{group_id}/conversations/{conversation_id}/chat/stream",
+        }
+    )
+
     def __init__(
         self,
         base_url: str,
@@ -71,21 +113,111 @@ class BackendE2ETester:
         self.run_id = uuid.uuid4().hex[:8]
         self.token_a = f"TOKEN_A_{self.run_id}_ALPHA123"
         self.token_b = f"TOKEN_B_{self.run_id}_BETA456"
+        # Ingested document contents depend only on the run's tokens.
+        self.group_a_text = f"This is Group A authoritative text. Unique token is {self.token_a}."
+        self.group_b_text = f"This is Group B authoritative text. Unique token is {self.token_b}.".encode()
+        # Keep-alive connections per (scheme, host), held separately per thread
+        # since an HTTPConnection carries one request at a time.
+        self._connections = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS, thread_name_prefix="e2e")
 
     def log(self, message: str) -> None:
         """Print a prefixed progress line for easier triage in CI/logs."""
         print(f"[e2e] {message}", flush=True)
 
+    @staticmethod
+    def _encode_json(payload: dict[str, Any]) -> bytes:
+        return json.dumps(payload, separators=(",", ":")).encode()
+
     @staticmethod
     def _decode_json(raw: bytes) -> dict[str, Any]:
         if not raw:
             return {}
         try:
-            return json.loads(raw.decode("utf-8"))
-        except json.JSONDecodeError as exc:
+            # json.loads detects the encoding of bytes itself; no decoded copy.
+            return json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
             preview = raw[:500].decode("utf-8", errors="ignore")
             raise E2EError(f"Invalid JSON response body: {preview}") from exc
 
+    def _parallel(self, *calls: Callable[[], T]) -> list[T]:
+        """Run independent calls concurrently; return results in order, raising the first failure."""
+        futures = [self._executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+    def _connection(self, scheme: str, netloc: str, timeout: float) -> http.client.HTTPConnection:
+        """Return the kept-alive connection to `netloc`, reconnecting if the server closed it."""
+        pool: dict[tuple[str, str], http.client.HTTPConnection] = self._connections.__dict__.setdefault(
+            "pool", {}
+        )
+        conn = pool.get((scheme, netloc))
+        if conn is None:
+            conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = conn_cls(netloc, timeout=timeout)
+            pool[(scheme, netloc)] = conn
+        elif conn.sock is not None and select.select([conn.sock], [], [], 0)[0]:
+            # An idle keep-alive socket only turns readable once the server has
+            # closed it; drop it so the request below opens a fresh one.
+            conn.close()
+
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn
+
+    def _open(
+        self,
+        method: str,
+        url: str,
+        body: bytes | Iterable[bytes] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a request on a reused connection and return it with the unread response."""
+        parts = urlsplit(url)
+        conn = self._connection(parts.scheme, parts.netloc, timeout or self.request_timeout_seconds)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        reused = conn.sock is not None
+        try:
+            conn.request(method, target, body=body, headers=headers or {})
+            return conn, conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            # The server can close an idle connection just as a request goes
+            # out on it (uvicorn's keep-alive timeout equals the longest
+            # health poll interval). Send it once more on a fresh
+            # connection, if the body can be replayed.
+            if not reused or not (body is None or isinstance(body, bytes)):
+                raise
+        except Exception:
+            conn.close()
+            raise
+
+        try:
+            conn.request(method, target, body=body, headers=headers or {})
+            return conn, conn.getresponse()
+        except Exception:
+            conn.close()
+            raise
+
+    def _fetch(
+        self,
+        method: str,
+        url: str,
+        body: bytes | Iterable[bytes] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> tuple[int, bytes]:
+        """Send a request and read the whole body, leaving the connection reusable."""
+        conn, response = self._open(method, url, body=body, headers=headers, timeout=timeout)
+        try:
+            return response.status, response.read()
+        except Exception:
+            conn.close()
+            raise
+
     def _post_json_url(
         self,
         url: str,
@@ -93,14 +225,17 @@ class BackendE2ETester:
         timeout: int,
     ) -> dict[str, Any]:
         """POST JSON to an absolute URL and return decoded response payload."""
-        req = urllib.request.Request(
+        status, raw = self._fetch(
+            "POST",
             url,
-            data=json.dumps(payload).encode("utf-8"),
-            method="POST",
-            headers={"Content-Type": "application/json"},
+            body=self._encode_json(payload),
+            headers=JSON_HEADERS,
+            timeout=timeout,
         )
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            return self._decode_json(response.read())
+        if status >= 400:
+            body_preview = raw.decode("utf-8", errors="ignore")[:900]
+            raise E2EError(f"POST {url} failed with {status}. Body={body_preview}")
+        return self._decode_json(raw)
 
     def request_json(
         self,
@@ -112,31 +247,20 @@ class BackendE2ETester:
         headers: dict[str, str] | None = None,
     ) -> tuple[int, dict[str, Any]]:
         """Send a JSON request and enforce expected status codes."""
-        req_headers = dict(headers or {})
         body = None
+        req_headers = headers
         if payload is not None:
-            body = json.dumps(payload).encode("utf-8")
-            req_headers.setdefault("Content-Type", "application/json")
+            body = self._encode_json(payload)
+            req_headers = JSON_HEADERS if headers is None else {**JSON_HEADERS, **headers}
 
-        req = urllib.request.Request(
+        status, raw = self._fetch(
+            method,
             f"{self.base_url}{path}",
-            data=body,
-            method=method,
+            body=body,
             headers=req_headers,
+            timeout=timeout or self.request_timeout_seconds,
         )
 
-        status = 0
-        raw = b""
-        try:
-            with urllib.request.urlopen(
-                req, timeout=timeout or self.request_timeout_seconds
-            ) as response:
-                status = response.status
-                raw = response.read()
-        except urllib.error.HTTPError as error:
-            status = error.code
-            raw = error.read()
-
         payload_data = self._decode_json(raw)
         if status not in expected_statuses:
             raise E2EError(
@@ -148,120 +272,146 @@ class BackendE2ETester:
     @staticmethod
     def _encode_multipart(
         fields: dict[str, str],
-        files: dict[str, tuple[str, str, bytes]],
-    ) -> tuple[bytes, str]:
+        files: dict[str, tuple[str, str, bytes | Path]],
+    ) -> tuple[list[bytes | Path], str]:
+        """Lay out a multipart body as segments; file contents given as a Path stay on disk."""
         boundary = f"----e2e{uuid.uuid4().hex}"
-        lines: list[bytes] = []
+        parts: list[bytes | Path] = []
 
         for name, value in fields.items():
-            lines.append(f"--{boundary}".encode())
-            lines.append(f'Content-Disposition: form-data; name="{name}"'.encode())
-            lines.append(b"")
-            lines.append(value.encode())
-
-        for name, (filename, content_type, file_bytes) in files.items():
-            lines.append(f"--{boundary}".encode())
-            lines.append(
-                f'Content-Disposition: form-data; name="{name}"; filename="{filename}"'.encode()
+            parts.append(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
             )
-            lines.append(f"Content-Type: {content_type}".encode())
-            lines.append(b"")
-            lines.append(file_bytes)
 
-        lines.append(f"--{boundary}--".encode())
-        lines.append(b"")
-        return b"\r\n".join(lines), f"multipart/form-data; boundary={boundary}"
+        for name, (filename, content_type, source) in files.items():
+            parts.append(
+                (
+                    f"--{boundary}\r\n"
+                    f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                    f"Content-Type: {content_type}\r\n\r\n"
+                ).encode()
+            )
+            parts.append(source)
+            parts.append(b"\r\n")
+
+        parts.append(f"--{boundary}--\r\n".encode())
+        return parts, f"multipart/form-data; boundary={boundary}"
+
+    @staticmethod
+    def _stream_parts(parts: list[bytes | Path]) -> Iterator[bytes]:
+        for part in parts:
+            if isinstance(part, Path):
+                with part.open("rb") as fp:
+                    while chunk := fp.read(UPLOAD_CHUNK_SIZE):
+                        yield chunk
+            else:
+                yield part
 
     def post_multipart(
         self,
         path: str,
-        files: dict[str, tuple[str, str, bytes]],
+        files: dict[str, tuple[str, str, bytes | Path]],
         timeout: int | None = None,
     ) -> dict[str, Any]:
         """POST multipart file upload and return parsed JSON response."""
-        body, content_type = self._encode_multipart({}, files)
-        req = urllib.request.Request(
+        parts, content_type = self._encode_multipart({}, files)
+        # An explicit length lets http.client send the streamed body as-is
+        # instead of switching to chunked transfer encoding.
+        content_length = sum(part.stat().st_size if isinstance(part, Path) else len(part) for part in parts)
+        status, raw = self._fetch(
+            "POST",
             f"{self.base_url}{path}",
-            data=body,
-            method="POST",
-            headers={"Content-Type": content_type},
+            body=self._stream_parts(parts),
+            headers={"Content-Type": content_type, "Content-Length": str(content_length)},
+            timeout=timeout or self.long_request_timeout_seconds,
         )
+        if status not in (200, 201):
+            body_preview = raw.decode("utf-8", errors="ignore")[:900]
+            raise E2EError(f"POST {path} returned {status}, expected 200/201. Body={body_preview}")
+        return self._decode_json(raw)
 
-        try:
-            with urllib.request.urlopen(
-                req, timeout=timeout or self.long_request_timeout_seconds
-            ) as response:
-                if response.status not in (200, 201):
-                    raise E2EError(
-                        f"POST {path} returned {response.status} instead of 200/201"
-                    )
-                return self._decode_json(response.read())
-        except urllib.error.HTTPError as error:
-            body_preview = error.read().decode("utf-8", errors="ignore")[:900]
-            raise E2EError(
-                f"POST {path} failed with {error.code}. Body={body_preview}"
-            ) from error
-
-    def read_sse_events(
+    def iter_sse_events(
         self,
         path: str,
         payload: dict[str, Any],
         timeout: int | None = None,
-    ) -> list[tuple[str, str]]:
-        """Read SSE events until `done` or fail on `error` event."""
-        req = urllib.request.Request(
+    ) -> Iterator[tuple[str, bytes]]:
+        """Yield SSE events until `done`; fail on an `error` event or a stream without `done`.
+
+        Events are yielded as they arrive rather than collected, so memory
+        stays flat however long the stream runs. Lines are matched as raw
+        bytes; only event names are decoded, and data is left as bytes
+        unless it is reported in an error.
+        """
+        conn, response = self._open(
+            "POST",
             f"{self.base_url}{path}",
-            data=json.dumps(payload).encode("utf-8"),
-            method="POST",
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "text/event-stream",
-            },
+            body=self._encode_json(payload),
+            headers=SSE_HEADERS,
+            timeout=timeout or self.long_request_timeout_seconds,
         )
 
-        events: list[tuple[str, str]] = []
         current_event = ""
-        with urllib.request.urlopen(req, timeout=timeout or self.long_request_timeout_seconds) as response:
+        done_seen = False
+        try:
+            if response.status >= 400:
+                body_preview = response.read().decode("utf-8", errors="ignore")[:900]
+                raise E2EError(f"POST {path} failed with {response.status}. Body={body_preview}")
             for raw_line in response:
-                line = raw_line.decode("utf-8", errors="ignore").strip()
-                if not line:
-                    continue
-                if line.startswith("event:"):
-                    current_event = line.split(":", 1)[1].strip()
+                line = raw_line.strip()
+                if line.startswith(b"event:"):
+                    current_event = sys.intern(line[6:].strip().decode("utf-8", errors="ignore"))
                     continue
-                if not line.startswith("data:"):
+                if not line.startswith(b"data:"):
                     continue
 
-                data = line.split(":", 1)[1].strip()
-                events.append((current_event, data))
+                data = line[5:].strip()
+                if current_event == EVENT_ERROR:
+                    raise E2EError(f"SSE error from {path}: {data.decode('utf-8', errors='ignore')}")
 
-                if current_event == "error":
-                    raise E2EError(f"SSE error from {path}: {data}")
-                if current_event == "done":
+                yield current_event, data
+                if current_event == EVENT_DONE:
+                    done_seen = True
                     break
+        finally:
+            # Stopping at `done` can leave the stream's tail unread; such a
+            # connection cannot carry another request.
+            if not response.isclosed():
+                conn.close()
 
-        if not any(event == "done" for event, _ in events):
+        if not done_seen:
             raise E2EError(f"SSE stream {path} ended without a done event")
-        return events
 
-    @staticmethod
-    def fire_and_disconnect(path: str, payload: dict[str, Any]) -> None:
+    def fire_and_disconnect(self, path: str, payload: dict[str, Any]) -> None:
         """Send request bytes then close socket immediately to simulate client cancellation."""
-        body = json.dumps(payload).encode("utf-8")
-        conn = http.client.HTTPConnection("localhost", 8000, timeout=5)
-        conn.putrequest("POST", path)
-        conn.putheader("Content-Type", "application/json")
-        conn.putheader("Content-Length", str(len(body)))
-        conn.endheaders()
-        conn.send(body)
-        conn.close()
+        body = self._encode_json(payload)
+        conn = http.client.HTTPConnection(urlsplit(self.base_url).netloc, timeout=5)
+        try:
+            conn.putrequest("POST", path)
+            conn.putheader("Content-Type", "application/json")
+            conn.putheader("Content-Length", str(len(body)))
+            conn.endheaders()
+            conn.send(body)
+            # Half-close first so the request is flushed and the server sees
+            # end-of-stream, rather than a reset, as the cancellation.
+            conn.sock.shutdown(socket.SHUT_WR)
+        finally:
+            conn.close()
 
     def wait_for_models(self) -> dict[str, Any]:
-        """Poll health until backend reports all expected models as loaded."""
+        """Poll health until backend reports all expected models as loaded.
+
+        Warmups run in the background so polling continues while a model
+        loads, and readiness is seen as soon as health reports it. Polls
+        back off from 250 ms to 5 s, so an already warm stack is picked up
+        almost immediately.
+        """
         deadline = time.time() + self.health_timeout_seconds
         last_health: dict[str, Any] = {}
         expected = set(self.expected_models)
         next_warmup_at = 0.0
+        warmup: Future[None] | None = None
+        delay = 0.25
 
         while time.time() < deadline:
             _, health = self.request_json(
@@ -275,17 +425,20 @@ class BackendE2ETester:
             if health.get("models_loaded") and expected.issubset(loaded_models):
                 return health
 
+            if warmup is not None and warmup.done():
+                if (exc := warmup.exception()) is not None:
+                    self.log(f"warmup request failed: {exc}")
+                warmup = None
+
             now = time.time()
-            if now >= next_warmup_at:
+            if warmup is None and now >= next_warmup_at:
                 self.log("models not ready; forcing Ollama warmup for required models")
-                try:
-                    self.warm_models_once()
-                except Exception as exc:
-                    self.log(f"warmup request failed: {exc}")
+                warmup = self._executor.submit(self.warm_models_once)
                 next_warmup_at = now + 30
 
             self.log(f"Models not ready yet: {health}")
-            time.sleep(5)
+            time.sleep(delay)
+            delay = min(delay * 1.5, 5.0)
 
         raise E2EError(
             f"Timed out waiting for models to load. Last health payload: {last_health}"
@@ -293,10 +446,10 @@ class BackendE2ETester:
 
     def assert_ollama_gpu_residency(self) -> dict[str, Any]:
         """Validate expected models are loaded and assigned to GPU processors."""
-        with urllib.request.urlopen(
-            f"{self.ollama_base_url}/api/ps", timeout=self.request_timeout_seconds
-        ) as response:
-            payload = self._decode_json(response.read())
+        status, raw = self._fetch("GET", f"{self.ollama_base_url}/api/ps")
+        if status >= 400:
+            raise E2EError(f"GET {self.ollama_base_url}/api/ps failed with {status}")
+        payload = self._decode_json(raw)
 
         models = payload.get("models", [])
         model_map = {
@@ -354,71 +507,53 @@ class BackendE2ETester:
         _, openapi = self.request_json("GET", "/openapi.json", expected_statuses=(200,))
         paths = openapi.get("paths", {})
 
-        required_paths = {
-            "/health",
-            "/groups",
-            "/groups/{group_id}",
-            "/groups/{group_id}/documents",
-            "/groups/{group_id}/documents/upload",
-            "/groups/{group_id}/documents/{document_id}",
-            "/groups/{group_id}/query",
-            "/groups/{group_id}/query/stream",
-            "/groups/{group_id}/conversations",
-            "/groups/{group_id}/conversations/{conversation_id}",
-            "/groups/{group_id}/conversations/{conversation_id}/chat",
-            "/groups/{group_id}/conversations/{conversation_id}/chat/stream",
-        }
-        missing_paths = sorted(required_paths - set(paths.keys()))
+        missing_paths = sorted(self.REQUIRED_PATHS.difference(paths))
         if missing_paths:
             raise E2EError(f"OpenAPI missing paths: {missing_paths}")
 
-        document_item_methods = set(paths["/groups/{group_id}/documents/{document_id}"].keys())
-        if "delete" not in document_item_methods:
+        if "delete" not in paths["/groups/{group_id}/documents/{document_id}"]:
             raise E2EError(
                 "OpenAPI is missing DELETE /groups/{group_id}/documents/{document_id}"
             )
 
+    @staticmethod
+    def _group_path(group_id: str, suffix: str = "") -> str:
+        return f"/groups/{group_id}{suffix}"
+
+    @staticmethod
+    def _document_path(group_id: str, document_id: str) -> str:
+        return f"/groups/{group_id}/documents/{document_id}"
+
+    @staticmethod
+    def _conversation_path(group_id: str, conversation_id: str) -> str:
+        return f"/groups/{group_id}/conversations/{conversation_id}"
+
     def _ensure_404(self, path: str) -> None:
         status, _ = self.request_json("GET", path, expected_statuses=(404,))
         if status != 404:
             raise E2EError(f"Expected 404 from {path}, got {status}")
 
+    def _delete_and_ensure_404(self, path: str) -> None:
+        self.request_json("DELETE", path, expected_statuses=(204,))
+        self._ensure_404(path)
+
+    def _delete_quietly(self, path: str) -> None:
+        try:
+            self.request_json("DELETE", path, expected_statuses=(204, 404), timeout=10)
+        except Exception:
+            pass
+
     def _cleanup_best_effort(self) -> None:
         """Cleanup transient entities if a mid-run failure occurs."""
+        item_paths = []
         if self.state.conversation_id and self.state.group_a_id:
-            try:
-                self.request_json(
-                    "DELETE",
-                    f"/groups/{self.state.group_a_id}/conversations/{self.state.conversation_id}",
-                    expected_statuses=(204, 404),
-                    timeout=10,
-                )
-            except Exception:
-                pass
-
+            item_paths.append(self._conversation_path(self.state.group_a_id, self.state.conversation_id))
         if self.state.group_b_document_id and self.state.group_b_id:
-            try:
-                self.request_json(
-                    "DELETE",
-                    f"/groups/{self.state.group_b_id}/documents/{self.state.group_b_document_id}",
-                    expected_statuses=(204, 404),
-                    timeout=10,
-                )
-            except Exception:
-                pass
-
-        for group_id in [self.state.group_a_id, self.state.group_b_id]:
-            if not group_id:
-                continue
-            try:
-                self.request_json(
-                    "DELETE",
-                    f"/groups/{group_id}",
-                    expected_statuses=(204, 404),
-                    timeout=10,
-                )
-            except Exception:
-                pass
+            item_paths.append(self._document_path(self.state.group_b_id, self.state.group_b_document_id))
+        self._parallel(*(partial(self._delete_quietly, path) for path in item_paths))
+
+        group_ids = [group_id for group_id in (self.state.group_a_id, self.state.group_b_id) if group_id]
+        self._parallel(*(partial(self._delete_quietly, self._group_path(group_id)) for group_id in group_ids))
 
     def run(self) -> int:
         """Execute end-to-end backend verification and return process exit code."""
@@ -435,75 +570,75 @@ class BackendE2ETester:
             self.log(f"ollama ps models: {[m.get('model') for m in ps_before.get('models', [])]}")
 
             self.log("4/14 creating two groups and updating one")
-            _, group_a = self.request_json(
-                "POST",
-                "/groups",
-                payload={
-                    "name": f"E2E Group A {self.run_id}",
-                    "description": "Group A for isolation",
-                },
-                expected_statuses=(201,),
-            )
-            _, group_b = self.request_json(
-                "POST",
-                "/groups",
-                payload={
-                    "name": f"E2E Group B {self.run_id}",
-                    "description": "Group B for isolation",
-                },
-                expected_statuses=(201,),
+            (_, group_a), (_, group_b) = self._parallel(
+                partial(
+                    self.request_json,
+                    "POST",
+                    "/groups",
+                    payload={
+                        "name": f"E2E Group A {self.run_id}",
+                        "description": "Group A for isolation",
+                    },
+                    expected_statuses=(201,),
+                ),
+                partial(
+                    self.request_json,
+                    "POST",
+                    "/groups",
+                    payload={
+                        "name": f"E2E Group B {self.run_id}",
+                        "description": "Group B for isolation",
+                    },
+                    expected_statuses=(201,),
+                ),
             )
             self.state.group_a_id = str(group_a["id"])
             self.state.group_b_id = str(group_b["id"])
 
             self.request_json(
                 "PATCH",
-                f"/groups/{self.state.group_a_id}",
+                self._group_path(self.state.group_a_id),
                 payload={"description": "Updated by E2E"},
                 expected_statuses=(200,),
             )
 
             self.log("5/14 ingesting text and file documents")
-            _, doc_a = self.request_json(
-                "POST",
-                f"/groups/{self.state.group_a_id}/documents",
-                payload={
-                    "filename": f"group_a_{self.run_id}.txt",
-                    "content": (
-                        "This is Group A authoritative text. "
-                        f"Unique token is {self.token_a}."
-                    ),
-                },
-                timeout=self.long_request_timeout_seconds,
-                expected_statuses=(201,),
-            )
-
-            group_b_text = (
-                "This is Group B authoritative text. "
-                f"Unique token is {self.token_b}."
-            ).encode("utf-8")
-            doc_b = self.post_multipart(
-                f"/groups/{self.state.group_b_id}/documents/upload",
-                files={
-                    "file": (
-                        f"group_b_{self.run_id}.txt",
-                        "text/plain",
-                        group_b_text,
-                    )
-                },
-                timeout=self.long_request_timeout_seconds,
+            (_, doc_a), doc_b = self._parallel(
+                partial(
+                    self.request_json,
+                    "POST",
+                    self._group_path(self.state.group_a_id, "/documents"),
+                    payload={
+                        "filename": f"group_a_{self.run_id}.txt",
+                        "content": self.group_a_text,
+                    },
+                    timeout=self.long_request_timeout_seconds,
+                    expected_statuses=(201,),
+                ),
+                partial(
+                    self.post_multipart,
+                    self._group_path(self.state.group_b_id, "/documents/upload"),
+                    files={
+                        "file": (
+                            f"group_b_{self.run_id}.txt",
+                            "text/plain",
+                            self.group_b_text,
+                        )
+                    },
+                    timeout=self.long_request_timeout_seconds,
+                ),
             )
             self.state.group_b_document_id = str(doc_b["id"])
 
             if self.pdf_path.exists():
                 self.log("6/14 ingesting sample PDF into Group A")
                 self.post_multipart(
-                    f"/groups/{self.state.group_a_id}/documents/upload",
+                    self._group_path(self.state.group_a_id, "/documents/upload"),
                     files={
                         "file": (
                             self.pdf_path.name,
                             "application/pdf",
-                            self.pdf_path.read_bytes(),
+                            self.pdf_path,
                         )
                     },
                     timeout=max(self.long_request_timeout_seconds, 1800),
@@ -512,79 +647,98 @@ class BackendE2ETester:
                 self.log(f"6/14 sample PDF not found at {self.pdf_path}, skipping PDF stage")
 
             self.log("7/14 checking document list/get")
-            _, docs_a = self.request_json(
-                "GET",
-                f"/groups/{self.state.group_a_id}/documents",
-                expected_statuses=(200,),
-            )
-            _, docs_b = self.request_json(
-                "GET",
-                f"/groups/{self.state.group_b_id}/documents",
-                expected_statuses=(200,),
+            (_, docs_a), (_, docs_b), _, _ = self._parallel(
+                partial(
+                    self.request_json,
+                    "GET",
+                    self._group_path(self.state.group_a_id, "/documents"),
+                    expected_statuses=(200,),
+                ),
+                partial(
+                    self.request_json,
+                    "GET",
+                    self._group_path(self.state.group_b_id, "/documents"),
+                    expected_statuses=(200,),
+                ),
+                partial(
+                    self.request_json,
+                    "GET",
+                    self._document_path(self.state.group_a_id, doc_a["id"]),
+                    expected_statuses=(200,),
+                ),
+                partial(
+                    self.request_json,
+                    "GET",
+                    self._document_path(self.state.group_b_id, self.state.group_b_document_id),
+                    expected_statuses=(200,),
+                ),
             )
-            if int(docs_a.get("total", 0)) < 1 or int(docs_b.get("total", 0)) < 1:
+            if docs_a.get("total", 0) < 1 or docs_b.get("total", 0) < 1:
                 raise E2EError("Expected at least one document in each group after ingestion")
 
-            self.request_json(
-                "GET",
-                f"/groups/{self.state.group_a_id}/documents/{doc_a['id']}",
-                expected_statuses=(200,),
-            )
-            self.request_json(
-                "GET",
-                f"/groups/{self.state.group_b_id}/documents/{self.state.group_b_document_id}",
-                expected_statuses=(200,),
-            )
-
             self.log("8/14 validating all query modes")
-            for mode in ["naive", "local", "global", "hybrid", "mix"]:
-                _, query_response = self.request_json(
-                    "POST",
-                    f"/groups/{self.state.group_a_id}/query",
-                    payload={
-                        "query": "Return Group A unique token exactly.",
-                        "mode": mode,
-                    },
-                    timeout=self.long_request_timeout_seconds,
-                    expected_statuses=(200,),
+            modes = ["naive", "local", "global", "hybrid", "mix"]
+            mode_responses = self._parallel(
+                *(
+                    partial(
+                        self.request_json,
+                        "POST",
+                        self._group_path(self.state.group_a_id, "/query"),
+                        payload={
+                            "query": "Return Group A unique token exactly.",
+                            "mode": mode,
+                        },
+                        timeout=self.long_request_timeout_seconds,
+                        expected_statuses=(200,),
+                    )
+                    for mode in modes
                 )
-                content = str(query_response.get("response", ""))
-                if not content.strip():
+            )
+            for mode, (_, query_response) in zip(modes, mode_responses, strict=True):
+                if not (query_response.get("response") or "").strip():
                     raise E2EError(f"Query mode '{mode}' returned an empty response")
 
             self.log("9/14 validating cross-group isolation")
-            _, query_a = self.request_json(
-                "POST",
-                f"/groups/{self.state.group_a_id}/query",
-                payload={"query": "What is Group A token?", "mode": "mix"},
-                timeout=self.long_request_timeout_seconds,
-                expected_statuses=(200,),
-            )
-            _, query_b = self.request_json(
-                "POST",
-                f"/groups/{self.state.group_b_id}/query",
-                payload={"query": "What is Group B token?", "mode": "mix"},
-                timeout=self.long_request_timeout_seconds,
-                expected_statuses=(200,),
+            (_, query_a), (_, query_b) = self._parallel(
+                partial(
+                    self.request_json,
+                    "POST",
+                    self._group_path(self.state.group_a_id, "/query"),
+                    payload={"query": "What is Group A token?", "mode": "mix"},
+                    timeout=self.long_request_timeout_seconds,
+                    expected_statuses=(200,),
+                ),
+                partial(
+                    self.request_json,
+                    "POST",
+                    self._group_path(self.state.group_b_id, "/query"),
+                    payload={"query": "What is Group B token?", "mode": "mix"},
+                    timeout=self.long_request_timeout_seconds,
+                    expected_statuses=(200,),
+                ),
             )
-            if self.token_a not in str(query_a.get("response", "")):
+            if self.token_a not in (query_a.get("response") or ""):
                 raise E2EError("Group A isolation check failed: token missing")
-            if self.token_b not in str(query_b.get("response", "")):
+            if self.token_b not in (query_b.get("response") or ""):
                 raise E2EError("Group B isolation check failed: token missing")
 
             self.log("10/14 validating query SSE stream")
-            stream_events = self.read_sse_events(
-                f"/groups/{self.state.group_a_id}/query/stream",
-                payload={"query": "Summarize Group A context.", "mode": "mix"},
-                timeout=self.long_request_timeout_seconds,
+            stream_chunks = sum(
+                1
+                for event, _ in self.iter_sse_events(
+                    self._group_path(self.state.group_a_id, "/query/stream"),
+                    payload={"query": "Summarize Group A context.", "mode": "mix"},
+                    timeout=self.long_request_timeout_seconds,
+                )
+                if event == EVENT_CHUNK
             )
-            if sum(1 for event, _ in stream_events if event == "chunk") == 0:
+            if stream_chunks == 0:
                 raise E2EError("Query stream returned no chunk events")
 
             self.log("11/14 validating conversation APIs")
             _, conv = self.request_json(
                 "POST",
-                f"/groups/{self.state.group_a_id}/conversations",
+                self._group_path(self.state.group_a_id, "/conversations"),
                 payload={"title": f"E2E Conversation {self.run_id}"},
                 expected_statuses=(201,),
             )
@@ -592,96 +746,104 @@ class BackendE2ETester:
 
             _, conv_list = self.request_json(
                 "GET",
-                f"/groups/{self.state.group_a_id}/conversations",
+                self._group_path(self.state.group_a_id, "/conversations"),
                 expected_statuses=(200,),
             )
-            if int(conv_list.get("total", 0)) < 1:
+            if conv_list.get("total", 0) < 1:
                 raise E2EError("Conversation list should include the newly created conversation")
 
             self.request_json(
                 "POST",
-                f"/groups/{self.state.group_a_id}/conversations/{self.state.conversation_id}/chat",
+                self._conversation_path(self.state.group_a_id, self.state.conversation_id) + "/chat",
                 payload={"message": "Reply with Group A token only.", "mode": "mix"},
                 timeout=self.long_request_timeout_seconds,
                 expected_statuses=(200,),
             )
-            conv_stream_events = self.read_sse_events(
-                f"/groups/{self.state.group_a_id}/conversations/{self.state.conversation_id}/chat/stream",
-                payload={"message": "Reply with Group A token and reason.", "mode": "mix"},
-                timeout=self.long_request_timeout_seconds,
+            conv_stream_chunks = sum(
+                1
+                for event, _ in self.iter_sse_events(
+                    self._conversation_path(self.state.group_a_id, self.state.conversation_id) + "/chat/stream",
+                    payload={"message": "Reply with Group A token and reason.", "mode": "mix"},
+                    timeout=self.long_request_timeout_seconds,
+                )
+                if event == EVENT_CHUNK
             )
-            if sum(1 for event, _ in conv_stream_events if event == "chunk") == 0:
+            if conv_stream_chunks == 0:
                 raise E2EError("Conversation stream returned no chunk events")
 
             _, conv_history = self.request_json(
                 "GET",
-                f"/groups/{self.state.group_a_id}/conversations/{self.state.conversation_id}",
+                self._conversation_path(self.state.group_a_id, self.state.conversation_id),
                 expected_statuses=(200,),
             )
             if len(conv_history.get("messages", [])) < 2:
                 raise E2EError("Conversation history did not persist user/assistant messages")
 
             self.log("12/14 validating interrupt/disconnect resilience")
-            self.fire_and_disconnect(
-                f"/groups/{self.state.group_a_id}/query",
-                {"query": "Long answer for disconnect test.", "mode": "mix"},
-            )
-            self.fire_and_disconnect(
-                f"/groups/{self.state.group_a_id}/query/stream",
-                {"query": "Long stream answer for disconnect test.", "mode": "mix"},
+            self._parallel(
+                partial(
+                    self.fire_and_disconnect,
+                    self._group_path(self.state.group_a_id, "/query"),
+                    {"query": "Long answer for disconnect test.", "mode": "mix"},
+                ),
+                partial(
+                    self.fire_and_disconnect,
+                    self._group_path(self.state.group_a_id, "/query/stream"),
+                    {"query": "Long stream answer for disconnect test.", "mode": "mix"},
+                ),
             )
-            time.sleep(2)
 
-            _, health_after_interrupt = self.request_json(
+            for _ in range(10):
+                _, health_after_interrupt = self.request_json(
+                    "GET",
+                    "/health",
+                    timeout=10,
+                    expected_statuses=(200,),
+                )
+                if health_after_interrupt.get("models_loaded"):
+                    break
+                time.sleep(0.2)
+            else:
+                raise E2EError("Health degraded after interrupt/disconnect checks")
+
+            # /health is answered from a background-refreshed cache, so it can
+            # pass before the dropped requests are cleaned up; a real database
+            # read shows the server itself is still serving.
+            self.request_json(
                 "GET",
-                "/health",
+                self._group_path(self.state.group_a_id, "/conversations"),
                 timeout=10,
                 expected_statuses=(200,),
             )
-            if not health_after_interrupt.get("models_loaded"):
-                raise E2EError("Health degraded after interrupt/disconnect checks")
 
             self.request_json(
                 "POST",
-                f"/groups/{self.state.group_a_id}/query",
+                self._group_path(self.state.group_a_id, "/query"),
                 payload={"query": "Quick post-interrupt query.", "mode": "mix"},
                 timeout=self.long_request_timeout_seconds,
                 expected_statuses=(200,),
             )
 
             self.log("13/14 deleting document, conversation, and groups")
-            self.request_json(
-                "DELETE",
-                f"/groups/{self.state.group_b_id}/documents/{self.state.group_b_document_id}",
-                expected_statuses=(204,),
-            )
-            self._ensure_404(
-                f"/groups/{self.state.group_b_id}/documents/{self.state.group_b_document_id}"
+            # Items go before their groups, so their own deletes are exercised
+            # rather than the group cascade.
+            self._parallel(
+                partial(
+                    self._delete_and_ensure_404,
+                    self._document_path(self.state.group_b_id, self.state.group_b_document_id),
+                ),
+                partial(
+                    self._delete_and_ensure_404,
+                    self._conversation_path(self.state.group_a_id, self.state.conversation_id),
+                ),
             )
             self.state.group_b_document_id = None
-
-            self.request_json(
-                "DELETE",
-                f"/groups/{self.state.group_a_id}/conversations/{self.state.conversation_id}",
-                expected_statuses=(204,),
-            )
-            self._ensure_404(
-                f"/groups/{self.state.group_a_id}/conversations/{self.state.conversation_id}"
-            )
             self.state.conversation_id = None
 
-            self.request_json(
-                "DELETE",
-                f"/groups/{self.state.group_b_id}",
-                expected_statuses=(204,),
-            )
-            self.request_json(
-                "DELETE",
-                f"/groups/{self.state.group_a_id}",
-                expected_statuses=(204,),
+            self._parallel(
+                partial(self._delete_and_ensure_404, self._group_path(self.state.group_b_id)),
+                partial(self._delete_and_ensure_404, self._group_path(self.state.group_a_id)),
             )
-            self._ensure_404(f"/groups/{self.state.group_a_id}")
-            self._ensure_404(f"/groups/{self.state.group_b_id}")
             self.state.group_a_id = None
             self.state.group_b_id = None
 
@@ -697,6 +859,7 @@ class BackendE2ETester:
 
         finally:
             self._cleanup_best_effort()
+            self._executor.shutdown(wait=False, cancel_futures=True)
 
 
 def parse_args() -> argparse.Namespace: